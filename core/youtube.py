@@ -0,0 +1,21 @@
+"""
+YouTube URL helpers shared by the generator, the thumbnail extractor and the CLIs
+"""
+
+import re
+from typing import Optional
+
+# Video ID patterns, tried in order
+_VIDEO_ID_PATTERNS = [
+    re.compile(r'(?:youtube\.com/watch\?v=|youtu\.be/|youtube\.com/embed/|youtube\.com/shorts/)([^&\n?#/]+)'),
+    re.compile(r'youtube\.com/v/([^&\n?#/]+)'),
+    re.compile(r'youtube\.com/watch\?.*?v=([^&\n?#]+)')
+]
+
+def get_video_id(url: str) -> Optional[str]:
+    """Extract video ID from YouTube URL"""
+    for pattern in _VIDEO_ID_PATTERNS:
+        match = pattern.search(url)
+        if match:
+            return match.group(1)
+    return None
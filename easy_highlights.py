@@ -7,23 +7,10 @@ Interactive interface that handles everything for you
 import os
 import sys
 import subprocess
-import re
 from pathlib import Path
 import shutil
 
-def get_video_id(url):
-    """Extract video ID from YouTube URL"""
-    patterns = [
-        r'(?:youtube\.com/watch\?v=|youtu\.be/|youtube\.com/embed/)([^&\n?#]+)',
-        r'youtube\.com/v/([^&\n?#]+)',
-        r'youtube\.com/watch\?.*?v=([^&\n?#]+)'
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, url)
-        if match:
-            return match.group(1)
-    return None
+from core.youtube import get_video_id
 
 def check_dependencies():
     """Check if required tools are available"""
@@ -120,8 +120,12 @@ def add_visual_distinction_to_html(html_file_path):
         
     </style>"""
     
-    # Insert the CSS before closing </style>
-    html_content = html_content.replace("</style>", css_additions)
+    # Insert the CSS before closing </style> (pages that link an external
+    # stylesheet get their own <style> block in the head)
+    if "</style>" in html_content:
+        html_content = html_content.replace("</style>", css_additions)
+    else:
+        html_content = html_content.replace("</head>", "    <style>" + css_additions + "\n</head>", 1)
     
     # Add segment classes to the cards
     for i in range(1, 5):
@@ -5,9 +5,17 @@ Creates beautiful highlight pages from YouTube videos and transcripts
 """
 
 import os
+import io
 import sys
 import re
+import shutil
+import subprocess
 import argparse
+import bisect
+import functools
+import string
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
 from pathlib import Path
 from urllib.parse import parse_qs, urlparse
 import json
@@ -17,8 +25,6 @@ from datetime import timedelta
 try:
     from pytube import YouTube
     from moviepy import VideoFileClip
-    from transformers import pipeline, AutoTokenizer, AutoModelForSeq2SeqLM
-    import torch
     from PIL import Image, ImageDraw, ImageFont
     import numpy as np
     import requests
@@ -27,105 +33,163 @@ except ImportError as e:
     print("Run: pip3 install --user pytube moviepy transformers torch pillow numpy requests")
     sys.exit(1)
 
+# Optional JIT backend for the keyword scan in SegmentFinder
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+# Optional Aho-Corasick automaton for single-pass keyword matching
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
+from core.youtube import get_video_id
+
+@functools.lru_cache(maxsize=256)
+def _extract_video_id(youtube_url):
+    """Extract video ID from YouTube URL"""
+    return get_video_id(youtube_url) or "unknown"
+
+@functools.lru_cache(maxsize=256)
+def _format_timestamp(seconds):
+    """Format seconds as MM:SS or HH:MM:SS"""
+    if seconds < 3600:
+        return f"{int(seconds // 60):02d}:{int(seconds % 60):02d}"
+    else:
+        hours = int(seconds // 3600)
+        minutes = int((seconds % 3600) // 60)
+        secs = int(seconds % 60)
+        return f"{hours:02d}:{minutes:02d}:{secs:02d}"
+
 class TranscriptParser:
     """Parse WebVTT and SRT transcript files"""
     
     @staticmethod
     def parse_vtt(file_path):
         """Parse WebVTT format with improved handling for YouTube captions"""
-        segments = []
+        return list(TranscriptParser.iter_vtt(file_path))
+    
+    @staticmethod
+    def parse_vtt_bytes(data):
+        """Parse WebVTT content already in memory (UTF-8 bytes), no file round-trip"""
+        # newline=None gives the same universal-newline handling as open()
+        lines = io.StringIO(data.decode('utf-8'), newline=None)
+        return list(TranscriptParser._iter_vtt_lines(lines))
+    
+    @staticmethod
+    def iter_vtt(file_path):
+        """Yield WebVTT cues one at a time, reading the file line by line"""
         with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Split by double newlines to separate cues
-        cues = re.split(r'\n\s*\n', content)
-        
-        for cue in cues:
-            lines = cue.strip().split('\n')
-            if len(lines) < 2:
-                continue
-                
-            # Look for timestamp line and text lines
-            timestamp_line = None
-            text_lines = []
-            
-            for line in lines:
-                line = line.strip()
-                if ' --> ' in line:
-                    # Extract timestamp, ignoring position/alignment info
-                    timestamp_line = line.split(' align:')[0].split(' position:')[0]
-                elif (line and 
-                      not line.startswith('WEBVTT') and 
-                      not line.startswith('Kind:') and
-                      not line.startswith('Language:') and
-                      not line.isdigit() and
-                      not ' --> ' in line):
-                    # Clean the text: remove inline timestamps and HTML tags
-                    clean_text = re.sub(r'<\d+:\d+:\d+\.\d+><c>', '', line)
-                    clean_text = re.sub(r'</c>', '', clean_text)
-                    clean_text = re.sub(r'<[^>]+>', '', clean_text)
-                    clean_text = clean_text.strip()
-                    
-                    if clean_text and clean_text not in text_lines:
-                        text_lines.append(clean_text)
+            yield from TranscriptParser._iter_vtt_lines(f)
+    
+    @staticmethod
+    def _iter_vtt_lines(lines):
+        """Yield WebVTT cues from an iterable of lines"""
+        for block in TranscriptParser._iter_blocks(lines):
+            segment = TranscriptParser._parse_vtt_cue(block)
+            if segment:
+                yield segment
+    
+    @staticmethod
+    def _parse_vtt_cue(lines):
+        """Parse one WebVTT cue (list of non-blank lines) into a segment"""
+        if len(lines) < 2:
+            return None
             
-            if timestamp_line and text_lines:
-                try:
-                    start_time, end_time = timestamp_line.split(' --> ')
-                    start_seconds = TranscriptParser._time_to_seconds(start_time.strip())
-                    end_seconds = TranscriptParser._time_to_seconds(end_time.strip())
-                    
-                    # Join text lines and clean up
-                    text = ' '.join(text_lines)
-                    if text:
-                        segments.append({
-                            'start': start_seconds,
-                            'end': end_seconds,
-                            'text': text
-                        })
-                except Exception as e:
-                    # Debug: print problematic lines
-                    # print(f"Failed to parse cue: {cue[:100]}... Error: {e}")
-                    continue
+        # Look for timestamp line and text lines
+        timestamp_line = None
+        text_lines = []
+        
+        for line in lines:
+            line = line.strip()
+            if ' --> ' in line:
+                # Extract timestamp, ignoring position/alignment info
+                timestamp_line = line.split(' align:')[0].split(' position:')[0]
+            elif (line and 
+                  not line.startswith('WEBVTT') and 
+                  not line.startswith('Kind:') and
+                  not line.startswith('Language:') and
+                  not line.isdigit() and
+                  not ' --> ' in line):
+                # Clean the text: remove inline timestamps and HTML tags
+                clean_text = re.sub(r'<\d+:\d+:\d+\.\d+><c>', '', line)
+                clean_text = re.sub(r'</c>', '', clean_text)
+                clean_text = re.sub(r'<[^>]+>', '', clean_text)
+                clean_text = clean_text.strip()
+                
+                if clean_text and clean_text not in text_lines:
+                    text_lines.append(clean_text)
         
-        return segments
+        if timestamp_line and text_lines:
+            try:
+                start_time, end_time = timestamp_line.split(' --> ')
+                start_seconds = TranscriptParser._time_to_seconds(start_time.strip())
+                end_seconds = TranscriptParser._time_to_seconds(end_time.strip())
+                
+                # Join text lines and clean up
+                text = ' '.join(text_lines)
+                if text:
+                    return {
+                        'start': start_seconds,
+                        'end': end_seconds,
+                        'text': text
+                    }
+            except Exception as e:
+                # Debug: print problematic lines
+                # print(f"Failed to parse cue: {lines[:3]}... Error: {e}")
+                pass
+        return None
     
     @staticmethod
     def parse_srt(file_path):
         """Parse SRT format"""
-        segments = []
+        return list(TranscriptParser.iter_srt(file_path))
+    
+    @staticmethod
+    def iter_srt(file_path):
+        """Yield SRT blocks one at a time, reading the file line by line"""
         with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Split by double newlines
-        blocks = re.split(r'\n\s*\n', content)
-        
-        for block in blocks:
-            lines = block.strip().split('\n')
-            if len(lines) < 3:
-                continue
-            
-            try:
-                # Line 0: sequence number
-                # Line 1: timestamps
-                # Line 2+: text
-                timestamp_line = lines[1]
-                text_lines = lines[2:]
+            for block in TranscriptParser._iter_blocks(f):
+                lines = '\n'.join(block).strip().split('\n')
+                if len(lines) < 3:
+                    continue
                 
-                if ' --> ' in timestamp_line:
-                    start_time, end_time = timestamp_line.split(' --> ')
-                    start_seconds = TranscriptParser._time_to_seconds(start_time.replace(',', '.'))
-                    end_seconds = TranscriptParser._time_to_seconds(end_time.replace(',', '.'))
+                try:
+                    # Line 0: sequence number
+                    # Line 1: timestamps
+                    # Line 2+: text
+                    timestamp_line = lines[1]
+                    text_lines = lines[2:]
                     
-                    segments.append({
-                        'start': start_seconds,
-                        'end': end_seconds,
-                        'text': ' '.join(text_lines)
-                    })
-            except:
-                continue
-        
-        return segments
+                    if ' --> ' in timestamp_line:
+                        start_time, end_time = timestamp_line.split(' --> ')
+                        start_seconds = TranscriptParser._time_to_seconds(start_time.replace(',', '.'))
+                        end_seconds = TranscriptParser._time_to_seconds(end_time.replace(',', '.'))
+                        
+                        yield {
+                            'start': start_seconds,
+                            'end': end_seconds,
+                            'text': ' '.join(text_lines)
+                        }
+                except:
+                    continue
+    
+    @staticmethod
+    def _iter_blocks(lines):
+        """Group an iterable of lines into blank-line separated blocks"""
+        block = []
+        for line in lines:
+            if line.strip():
+                block.append(line.rstrip('\n'))
+            elif block:
+                yield block
+                block = []
+        if block:
+            yield block
     
     @staticmethod
     def _time_to_seconds(time_str):
@@ -143,68 +207,160 @@ class TranscriptParser:
         else:
             return float(time_str)
 
+def _scan_keywords_py(texts, keywords):
+    """For each text return (index of first matching keyword or -1, number of matching keywords)"""
+    first_hits = []
+    scores = []
+    for text in texts:
+        first = -1
+        score = 0
+        for j, keyword in enumerate(keywords):
+            if keyword in text:
+                if first < 0:
+                    first = j
+                score += 1
+        first_hits.append(first)
+        scores.append(score)
+    return first_hits, scores
+
+if HAS_NUMBA:
+    @njit(cache=True)
+    def _scan_keywords_jit(text_blob, starts, ends, kw_blob, kw_starts, kw_ends):
+        """Numba version of _scan_keywords_py over flat text/offset arrays"""
+        n = starts.shape[0]
+        first_hits = np.full(n, -1, dtype=np.int64)
+        scores = np.zeros(n, dtype=np.int64)
+        for i in range(n):
+            text = text_blob[starts[i]:ends[i]]
+            for j in range(kw_starts.shape[0]):
+                if kw_blob[kw_starts[j]:kw_ends[j]] in text:
+                    if first_hits[i] < 0:
+                        first_hits[i] = j
+                    scores[i] += 1
+        return first_hits, scores
+
+def build_keyword_automaton(keywords):
+    """Build an Aho-Corasick automaton over lower-cased keywords (None if unavailable)"""
+    keywords = [kw.lower() for kw in keywords]
+    if not HAS_AHOCORASICK or not keywords or not all(keywords):
+        return None
+    # Each word maps to every list position it occupies so duplicates still count
+    positions = {}
+    for j, keyword in enumerate(keywords):
+        positions.setdefault(keyword, []).append(j)
+    automaton = ahocorasick.Automaton()
+    for keyword, idxs in positions.items():
+        automaton.add_word(keyword, tuple(idxs))
+    automaton.make_automaton()
+    return automaton
+
+def _scan_keywords_ac(texts, automaton):
+    """Same result as _scan_keywords_py using one automaton pass per text"""
+    first_hits = []
+    scores = []
+    for text in texts:
+        found = set()
+        for _, idxs in automaton.iter(text):
+            found.update(idxs)
+        first_hits.append(min(found) if found else -1)
+        scores.append(len(found))
+    return first_hits, scores
+
+def _flatten_strings(strings):
+    """Join strings with NUL separators and return (blob, starts, ends) for the JIT kernel"""
+    lengths = np.fromiter((len(text) for text in strings), dtype=np.int64, count=len(strings))
+    starts = np.zeros(len(strings), dtype=np.int64)
+    if len(strings) > 1:
+        starts[1:] = np.cumsum(lengths[:-1] + 1)
+    return '\x00'.join(strings), starts, starts + lengths
+
 class SegmentFinder:
     """Find interesting segments based on keywords"""
     
-    def __init__(self, keywords, context_window=5):
+    # Below this many transcript segments the JIT warm-up isn't worth it
+    NUMBA_MIN_SEGMENTS = 500
+    
+    def __init__(self, keywords, context_window=5, automaton=None):
         self.keywords = [kw.lower() for kw in keywords]
         self.context_window = context_window
+        self.automaton = automaton if automaton is not None else build_keyword_automaton(self.keywords)
+    
+    def _scan_keywords(self, texts):
+        """Score lower-cased segment texts against the keyword list"""
+        if self.automaton is not None:
+            return _scan_keywords_ac(texts, self.automaton)
+        if HAS_NUMBA and self.keywords and len(texts) >= self.NUMBA_MIN_SEGMENTS:
+            try:
+                text_blob, starts, ends = _flatten_strings(texts)
+                kw_blob, kw_starts, kw_ends = _flatten_strings(self.keywords)
+                first_hits, scores = _scan_keywords_jit(text_blob, starts, ends, kw_blob, kw_starts, kw_ends)
+                return first_hits.tolist(), scores.tolist()
+            except Exception as e:
+                print(f"⚠️  Numba keyword scan failed, using Python: {e}")
+        return _scan_keywords_py(texts, self.keywords)
+    
+    @staticmethod
+    def _overlaps_used(segment, used_starts, used_ends):
+        """Check a segment against the used ranges (disjoint, sorted by start)"""
+        # Only the used range with the latest start <= segment end can overlap
+        idx = bisect.bisect_right(used_starts, segment['end'])
+        return idx > 0 and used_ends[idx - 1] >= segment['start']
     
     def find_segments(self, transcript_segments, num_cards):
         """Find the most interesting segments"""
         keyword_segments = []
         
         # Find segments containing keywords
-        for i, segment in enumerate(transcript_segments):
-            text_lower = segment['text'].lower()
-            for keyword in self.keywords:
-                if keyword in text_lower:
-                    # Include context around the keyword
-                    start_idx = max(0, i - self.context_window)
-                    end_idx = min(len(transcript_segments), i + self.context_window + 1)
-                    
-                    context_segments = transcript_segments[start_idx:end_idx]
-                    combined_text = ' '.join([s['text'] for s in context_segments])
-                    
-                    keyword_segments.append({
-                        'start': context_segments[0]['start'],
-                        'end': context_segments[-1]['end'],
-                        'text': combined_text,
-                        'keyword': keyword,
-                        'score': len([kw for kw in self.keywords if kw in text_lower])
-                    })
-                    break
+        texts_lower = [segment['text'].lower() for segment in transcript_segments]
+        first_hits, scores = self._scan_keywords(texts_lower)
+        
+        for i, (first, score) in enumerate(zip(first_hits, scores)):
+            if first < 0:
+                continue
+            
+            # Include context around the keyword
+            start_idx = max(0, i - self.context_window)
+            end_idx = min(len(transcript_segments), i + self.context_window + 1)
+            
+            context_segments = transcript_segments[start_idx:end_idx]
+            combined_text = ' '.join([s['text'] for s in context_segments])
+            
+            keyword_segments.append({
+                'start': context_segments[0]['start'],
+                'end': context_segments[-1]['end'],
+                'text': combined_text,
+                'keyword': self.keywords[first],
+                'score': score
+            })
+        
+        # Order by score (most keywords first) and remove duplicates. Scores
+        # are small integers, so bucket them instead of sorting; buckets keep
+        # transcript order for ties, exactly like a stable sort
+        buckets = {}
+        for segment in keyword_segments:
+            buckets.setdefault(segment['score'], []).append(segment)
         
-        # Sort by score (most keywords) and remove duplicates
-        keyword_segments.sort(key=lambda x: x['score'], reverse=True)
         unique_segments = []
-        used_ranges = []
+        used_starts = []
+        used_ends = []
         
-        for segment in keyword_segments:
-            overlap = False
-            for used_start, used_end in used_ranges:
-                if not (segment['end'] < used_start or segment['start'] > used_end):
-                    overlap = True
-                    break
-            
-            if not overlap:
-                unique_segments.append(segment)
-                used_ranges.append((segment['start'], segment['end']))
+        for score in sorted(buckets, reverse=True):
+            for segment in buckets[score]:
+                if not self._overlaps_used(segment, used_starts, used_ends):
+                    unique_segments.append(segment)
+                    pos = bisect.bisect_left(used_starts, segment['start'])
+                    used_starts.insert(pos, segment['start'])
+                    used_ends.insert(pos, segment['end'])
         
         # If we need more segments, split the remaining transcript
         if len(unique_segments) < num_cards:
             remaining_needed = num_cards - len(unique_segments)
-            unused_segments = []
             
             # Find unused parts of transcript
-            for segment in transcript_segments:
-                used = False
-                for used_start, used_end in used_ranges:
-                    if not (segment['end'] < used_start or segment['start'] > used_end):
-                        used = True
-                        break
-                if not used:
-                    unused_segments.append(segment)
+            unused_segments = [
+                segment for segment in transcript_segments
+                if not self._overlaps_used(segment, used_starts, used_ends)
+            ]
             
             # Split unused segments into equal parts
             if unused_segments:
@@ -241,10 +397,29 @@ class AISummarizer:
         """Initialize the summarization model"""
         try:
             print("🤖 Loading AI summarization model...")
+            # Deferred so the parser/finder/HTML parts import without the ML stack
+            import torch
+            from transformers import pipeline, AutoTokenizer, AutoModelForSeq2SeqLM
+            tokenizer = AutoTokenizer.from_pretrained("facebook/bart-large-cnn", use_fast=True)
+            if torch.cuda.is_available():
+                # Inference only: half precision halves weight memory and speeds up GPU matmuls
+                dtype = torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+                model = AutoModelForSeq2SeqLM.from_pretrained(
+                    "facebook/bart-large-cnn", torch_dtype=dtype
+                ).to("cuda")
+                device = 0
+            else:
+                # CPU: dynamic int8 quantization of the Linear layers
+                model = AutoModelForSeq2SeqLM.from_pretrained("facebook/bart-large-cnn")
+                model = torch.ao.quantization.quantize_dynamic(
+                    model, {torch.nn.Linear}, dtype=torch.qint8
+                )
+                device = -1
             self.summarizer = pipeline(
                 "summarization",
-                model="facebook/bart-large-cnn",
-                device=0 if torch.cuda.is_available() else -1
+                model=model,
+                tokenizer=tokenizer,
+                device=device
             )
             print("✅ AI model loaded successfully!")
         except Exception as e:
@@ -263,12 +438,14 @@ class AISummarizer:
                 if len(text) > 1024:
                     text = text[:1024]
                 
-                result = self.summarizer(
-                    text,
-                    max_length=max_length,
-                    min_length=10,
-                    do_sample=False
-                )
+                import torch
+                with torch.inference_mode():
+                    result = self.summarizer(
+                        text,
+                        max_length=max_length,
+                        min_length=10,
+                        do_sample=False
+                    )
                 return result[0]['summary_text']
             except Exception as e:
                 print(f"AI summarization failed: {e}")
@@ -276,6 +453,35 @@ class AISummarizer:
         # Fallback: extractive summarization
         return self._extractive_summary(text, max_length)
     
+    def summarize_batch(self, texts, max_length=60):
+        """Summarize several texts with one batched model call"""
+        summaries = list(texts)
+        pending = [i for i, text in enumerate(texts) if text and len(text.strip()) >= 20]
+        
+        if self.summarizer and pending:
+            try:
+                # BART works best with 100-1024 tokens
+                batch = [texts[i][:1024] for i in pending]
+                import torch
+                with torch.inference_mode():
+                    results = self.summarizer(
+                        batch,
+                        batch_size=len(batch),
+                        max_length=max_length,
+                        min_length=10,
+                        do_sample=False
+                    )
+                for i, result in zip(pending, results):
+                    summaries[i] = result['summary_text']
+                return summaries
+            except Exception as e:
+                print(f"AI summarization failed: {e}")
+        
+        # Fallback: extractive summarization
+        for i in pending:
+            summaries[i] = self._extractive_summary(texts[i], max_length)
+        return summaries
+    
     def _extractive_summary(self, text, max_length):
         """Simple extractive summarization"""
         sentences = re.split(r'[.!?]+', text)
@@ -313,23 +519,192 @@ class AISummarizer:
         
         return ' '.join(selected) if selected else sentences[0][:max_length]
 
+# Color schemes for each segment to make them visually distinct
+THUMBNAIL_COLOR_SCHEMES = [
+    {"gradient": (255, 87, 51), "name": "ORANGE", "brightness": 1.2},      # Orange - brighter
+    {"gradient": (74, 144, 226), "name": "BLUE", "brightness": 0.8},      # Blue - darker
+    {"gradient": (156, 39, 176), "name": "PURPLE", "brightness": 1.15},   # Purple - bright
+    {"gradient": (76, 175, 80), "name": "GREEN", "brightness": 0.85},     # Green - darker
+]
+
+@functools.lru_cache(maxsize=1)
+def _ffmpeg_available():
+    """Check once per process whether ffmpeg is on PATH (no fork/exec)"""
+    return shutil.which('ffmpeg') is not None
+
+def optimize_image(image_path):
+    """Losslessly shrink an image in place with optipng/jpegoptim when installed"""
+    image_path = Path(image_path)
+    suffix = image_path.suffix.lower()
+    if suffix == '.png' and shutil.which('optipng'):
+        cmd = ['optipng', '-o2', '-quiet', str(image_path)]
+    elif suffix in ('.jpg', '.jpeg') and shutil.which('jpegoptim'):
+        cmd = ['jpegoptim', '--strip-all', '--all-progressive', '--quiet', str(image_path)]
+    else:
+        return False
+    try:
+        return subprocess.run(cmd, capture_output=True, timeout=60).returncode == 0
+    except (subprocess.SubprocessError, OSError):
+        return False
+
+# ITU-R 601-2 luma transform, as used by PIL's "L" mode
+_LUMA_WEIGHTS = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+# Rows per float scratch strip in _make_thumb (~0.5 MB at 1280px wide)
+_THUMB_STRIP_ROWS = 32
+
+def _make_thumb(i, segment, base_bytes, out_dir, optimize=True):
+    """Render one custom thumbnail (safe to run on a worker thread)"""
+    try:
+        # Decode once into a uint8 buffer and do all pixel work in place on it;
+        # the float math runs a strip of rows at a time in a small scratch
+        # array that stays in cache, instead of a full-size float copy
+        buf = np.array(Image.open(io.BytesIO(base_bytes)).convert('RGB'))
+        height, width = buf.shape[:2]
+
+        # Apply different visual effects based on segment
+        color_scheme = THUMBNAIL_COLOR_SCHEMES[i % len(THUMBNAIL_COLOR_SCHEMES)]
+        gradient_color = color_scheme["gradient"]
+        brightness = color_scheme["brightness"]  # Make segments look different
+        saturation = 0.8 + (i * 0.1)  # Vary color saturation
+
+        # Different overlay patterns for each segment - make them much more visible
+        overlay_alpha = 80 / 255  # Much more visible overlay
+        if i == 0:  # Top band
+            rows, cols = slice(0, height//3 + 1), slice(None)
+        elif i == 1:  # Right band
+            rows, cols = slice(0, height), slice(2*width//3, None)
+        elif i == 2:  # Bottom band
+            rows, cols = slice(2*height//3, height), slice(None)
+        else:  # Left band
+            rows, cols = slice(0, height), slice(0, width//3 + 1)
+        overlay = np.asarray(gradient_color, dtype=np.float32) * overlay_alpha
+
+        for top in range(0, height, _THUMB_STRIP_ROWS):
+            strip = buf[top:top + _THUMB_STRIP_ROWS]
+            work = strip.astype(np.float32)
+
+            # Apply brightness adjustment
+            work *= brightness
+            np.clip(work, 0, 255, out=work)
+
+            # Apply color tint: blend away from / towards the grayscale image
+            # (same luma weights as ImageEnhance.Color)
+            gray = (work @ _LUMA_WEIGHTS)[..., np.newaxis]
+            work -= gray
+            work *= saturation
+            work += gray
+            np.clip(work, 0, 255, out=work)
+
+            # Apply the colored overlay (alpha blend on the band rows in this strip)
+            first, last = max(rows.start - top, 0), min(rows.stop - top, len(strip))
+            if first < last:
+                region = work[first:last, cols]
+                region *= 1 - overlay_alpha
+                region += overlay
+
+            np.copyto(strip, np.rint(work, out=work), casting='unsafe')
+
+        img = Image.fromarray(buf)
+
+        draw = ImageDraw.Draw(img)
+
+        # Add timestamp overlay
+        timestamp = _format_timestamp(segment['start'])
+
+        # Try to use a nice font, fallback to default
+        font_size = 64
+        small_font_size = 42
+        try:
+            font = ImageFont.truetype("/System/Library/Fonts/Arial.ttf", font_size)
+            small_font = ImageFont.truetype("/System/Library/Fonts/Arial.ttf", small_font_size)
+        except:
+            try:
+                font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", font_size)
+                small_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", small_font_size)
+            except:
+                font = ImageFont.load_default()
+                small_font = ImageFont.load_default()
+
+        # Add large timestamp in bottom-right with theme color
+        text_bbox = draw.textbbox((0, 0), timestamp, font=font)
+        text_width = text_bbox[2] - text_bbox[0]
+        text_height = text_bbox[3] - text_bbox[1]
+
+        margin = 30
+        x = img.width - text_width - margin
+        y = img.height - text_height - margin
+
+        # Draw background with segment color
+        draw.rectangle([
+            x - 20, y - 15,
+            x + text_width + 20, y + text_height + 15
+        ], fill=gradient_color)
+
+        # Draw timestamp text
+        draw.text((x, y), timestamp, fill=(255, 255, 255), font=font)
+
+        # Add large segment indicator
+        segment_text = f"SEGMENT {i+1}"
+        segment_bbox = draw.textbbox((0, 0), segment_text, font=small_font)
+        segment_width = segment_bbox[2] - segment_bbox[0]
+        segment_height = segment_bbox[3] - segment_bbox[1]
+
+        # Position in top-left
+        seg_x = margin
+        seg_y = margin
+
+        # Draw background for segment indicator with contrasting color
+        contrast_color = (255 - gradient_color[0], 255 - gradient_color[1], 255 - gradient_color[2])
+        draw.rectangle([
+            seg_x - 20, seg_y - 15,
+            seg_x + segment_width + 20, seg_y + segment_height + 15
+        ], fill=contrast_color)
+
+        # Draw segment text
+        draw.text((seg_x, seg_y), segment_text, fill=gradient_color, font=small_font)
+
+        # Add color theme name in top-right
+        color_name = color_scheme["name"]
+        color_bbox = draw.textbbox((0, 0), color_name, font=small_font)
+        color_width = color_bbox[2] - color_bbox[0]
+        color_height = color_bbox[3] - color_bbox[1]
+
+        color_x = img.width - color_width - margin
+        color_y = margin
+
+        # Semi-transparent background
+        draw.rectangle([
+            color_x - 15, color_y - 10,
+            color_x + color_width + 15, color_y + color_height + 10
+        ], fill=(0, 0, 0, 150))
+
+        draw.text((color_x, color_y), color_name, fill=gradient_color, font=small_font)
+
+        # Save the customized thumbnail
+        thumbnail_path = Path(out_dir) / f"thumbnail_{i+1:03d}.png"
+        img.save(thumbnail_path, "PNG", optimize=optimize)
+        if optimize:
+            optimize_image(thumbnail_path)
+        return str(thumbnail_path)
+
+    except Exception as e:
+        print(f"Failed to generate custom thumbnail {i+1}: {e}")
+        return None
+
 class VideoProcessor:
     """Handle video download and frame extraction"""
     
-    def __init__(self, output_dir):
+    def __init__(self, output_dir, optimize_images=True):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
+        self.optimize_images = optimize_images
         self.video_id = None
         self.youtube_url = None
     
     def _has_ffmpeg(self):
         """Check if ffmpeg is available"""
-        try:
-            import subprocess
-            subprocess.run(['ffmpeg', '-version'], capture_output=True, check=True)
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            return False
+        return _ffmpeg_available()
     
     def download_video(self, youtube_url):
         """Download video from YouTube"""
@@ -339,16 +714,7 @@ class VideoProcessor:
             yt = YouTube(youtube_url)
             
             # Extract video ID for thumbnail fallbacks
-            import re
-            patterns = [
-                r'(?:youtube\.com/watch\?v=|youtu\.be/|youtube\.com/embed/)([^&\n?#]+)',
-                r'youtube\.com/v/([^&\n?#]+)',
-            ]
-            for pattern in patterns:
-                match = re.search(pattern, youtube_url)
-                if match:
-                    self.video_id = match.group(1)
-                    break
+            self.video_id = get_video_id(youtube_url)
             
             # Get best available stream
             stream = yt.streams.filter(progressive=True, file_extension='mp4').order_by('resolution').desc().first()
@@ -368,16 +734,7 @@ class VideoProcessor:
             print(f"❌ Video download failed: {e}")
             # Still extract video ID for thumbnail fallbacks
             if not self.video_id:
-                import re
-                patterns = [
-                    r'(?:youtube\.com/watch\?v=|youtu\.be/|youtube\.com/embed/)([^&\n?#]+)',
-                    r'youtube\.com/v/([^&\n?#]+)',
-                ]
-                for pattern in patterns:
-                    match = re.search(pattern, youtube_url)
-                    if match:
-                        self.video_id = match.group(1)
-                        break
+                self.video_id = get_video_id(youtube_url)
             return None, None
     
     def extract_thumbnails(self, video_path, segments):
@@ -391,7 +748,7 @@ class VideoProcessor:
                 from core.video_screenshot import VideoScreenshotExtractor
                 extractor = VideoScreenshotExtractor()
                 
-                for i, segment in enumerate(segments):
+                def extract_one(i, segment):
                     thumbnail_path = self.output_dir / f"thumbnail_{i+1:03d}.jpg"
                     
                     # Use smart extraction for better frame selection
@@ -403,9 +760,7 @@ class VideoProcessor:
                         fallback_on_error=True
                     )
                     
-                    if success and thumbnail_path.exists():
-                        thumbnails.append(str(thumbnail_path))
-                    else:
+                    if not (success and thumbnail_path.exists()):
                         # Try simple extraction at segment start
                         success = extractor.extract_screenshot(
                             self.youtube_url,
@@ -413,15 +768,23 @@ class VideoProcessor:
                             thumbnail_path,
                             fallback_on_error=True
                         )
-                        if success:
-                            thumbnails.append(str(thumbnail_path))
-                        else:
-                            thumbnails.append(None)
+                    if not success:
+                        return None
+                    
+                    if self.optimize_images:
+                        optimize_image(thumbnail_path)
+                    return str(thumbnail_path)
+                
+                # Each segment is a yt-dlp/ffmpeg subprocess pair, so threads
+                # are enough to overlap them
+                workers = min(len(segments), os.cpu_count() or 1) or 1
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    smart_thumbnails = list(executor.map(extract_one, range(len(segments)), segments))
                 
                 # If we got some thumbnails, return them
-                if any(thumbnails):
-                    print(f"✅ Extracted {len([t for t in thumbnails if t])} smart thumbnails")
-                    return thumbnails
+                if any(smart_thumbnails):
+                    print(f"✅ Extracted {len([t for t in smart_thumbnails if t])} smart thumbnails")
+                    return smart_thumbnails
                     
             except Exception as e:
                 print(f"⚠️ Smart extraction not available: {e}")
@@ -443,7 +806,9 @@ class VideoProcessor:
                         # Convert to PIL Image and save
                         img = Image.fromarray(frame)
                         thumbnail_path = self.output_dir / f"thumbnail_{i+1:03d}.png"
-                        img.save(thumbnail_path)
+                        img.save(thumbnail_path, optimize=self.optimize_images)
+                        if self.optimize_images:
+                            optimize_image(thumbnail_path)
                         
                         thumbnails.append(str(thumbnail_path))
                         
@@ -471,520 +836,130 @@ class VideoProcessor:
     
     def _generate_custom_thumbnails(self, segments):
         """Generate visually distinct thumbnail images for each segment"""
-        import requests
-        from PIL import Image, ImageDraw, ImageFont, ImageEnhance
-        import io
-        
-        thumbnails = []
-        
         # Download base thumbnail from YouTube
         base_thumbnail_url = f"https://img.youtube.com/vi/{self.video_id}/maxresdefault.jpg"
         try:
             response = requests.get(base_thumbnail_url, timeout=10)
-            base_image = Image.open(io.BytesIO(response.content))
-        except:
+            base_bytes = response.content
+            Image.open(io.BytesIO(base_bytes)).verify()
+        except (requests.RequestException, OSError):
             # Fallback to lower resolution
             base_thumbnail_url = f"https://img.youtube.com/vi/{self.video_id}/hqdefault.jpg"
             try:
                 response = requests.get(base_thumbnail_url, timeout=10)
-                base_image = Image.open(io.BytesIO(response.content))
-            except:
+                base_bytes = response.content
+                Image.open(io.BytesIO(base_bytes)).verify()
+            except (requests.RequestException, OSError):
                 return [None] * len(segments)
         
-        # Color schemes for each segment to make them visually distinct
-        color_schemes = [
-            {"gradient": (255, 87, 51), "name": "ORANGE", "brightness": 1.2},      # Orange - brighter
-            {"gradient": (74, 144, 226), "name": "BLUE", "brightness": 0.8},      # Blue - darker
-            {"gradient": (156, 39, 176), "name": "PURPLE", "brightness": 1.15},   # Purple - bright
-            {"gradient": (76, 175, 80), "name": "GREEN", "brightness": 0.85},     # Green - darker
-        ]
-        
-        for i, segment in enumerate(segments):
-            try:
-                # Create a copy of the base image
-                img = base_image.copy()
-                
-                # Apply different visual effects based on segment
-                color_scheme = color_schemes[i % len(color_schemes)]
-                gradient_color = color_scheme["gradient"]
-                
-                # Apply brightness adjustment to make segments look different
-                enhancer = ImageEnhance.Brightness(img)
-                img = enhancer.enhance(color_scheme["brightness"])
-                
-                # Apply color tint
-                enhancer = ImageEnhance.Color(img)
-                img = enhancer.enhance(0.8 + (i * 0.1))  # Vary color saturation
-                
-                # Create a colored overlay
-                overlay = Image.new('RGBA', img.size, (0, 0, 0, 0))
-                overlay_draw = ImageDraw.Draw(overlay)
-                
-                # Different overlay patterns for each segment - make them much more visible
-                overlay_alpha = 80  # Much more visible overlay
-                if i == 0:  # Top band
-                    overlay_draw.rectangle([0, 0, img.width, img.height//3], 
-                                         fill=gradient_color + (overlay_alpha,))
-                elif i == 1:  # Right band
-                    overlay_draw.rectangle([2*img.width//3, 0, img.width, img.height], 
-                                         fill=gradient_color + (overlay_alpha,))
-                elif i == 2:  # Bottom band
-                    overlay_draw.rectangle([0, 2*img.height//3, img.width, img.height], 
-                                         fill=gradient_color + (overlay_alpha,))
-                else:  # Left band
-                    overlay_draw.rectangle([0, 0, img.width//3, img.height], 
-                                         fill=gradient_color + (overlay_alpha,))
-                
-                # Apply the colored overlay
-                img = Image.alpha_composite(img.convert('RGBA'), overlay).convert('RGB')
-                
-                draw = ImageDraw.Draw(img)
-                
-                # Add timestamp overlay
-                timestamp = self._format_timestamp(segment['start'])
-                
-                # Try to use a nice font, fallback to default
-                font_size = 64
-                small_font_size = 42
-                try:
-                    font = ImageFont.truetype("/System/Library/Fonts/Arial.ttf", font_size)
-                    small_font = ImageFont.truetype("/System/Library/Fonts/Arial.ttf", small_font_size)
-                except:
-                    try:
-                        font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", font_size)
-                        small_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", small_font_size)
-                    except:
-                        font = ImageFont.load_default()
-                        small_font = ImageFont.load_default()
-                
-                # Add large timestamp in bottom-right with theme color
-                text_bbox = draw.textbbox((0, 0), timestamp, font=font)
-                text_width = text_bbox[2] - text_bbox[0]
-                text_height = text_bbox[3] - text_bbox[1]
-                
-                margin = 30
-                x = img.width - text_width - margin
-                y = img.height - text_height - margin
-                
-                # Draw background with segment color
-                draw.rectangle([
-                    x - 20, y - 15,
-                    x + text_width + 20, y + text_height + 15
-                ], fill=gradient_color)
-                
-                # Draw timestamp text
-                draw.text((x, y), timestamp, fill=(255, 255, 255), font=font)
-                
-                # Add large segment indicator
-                segment_text = f"SEGMENT {i+1}"
-                segment_bbox = draw.textbbox((0, 0), segment_text, font=small_font)
-                segment_width = segment_bbox[2] - segment_bbox[0]
-                segment_height = segment_bbox[3] - segment_bbox[1]
-                
-                # Position in top-left
-                seg_x = margin
-                seg_y = margin
-                
-                # Draw background for segment indicator with contrasting color
-                contrast_color = (255 - gradient_color[0], 255 - gradient_color[1], 255 - gradient_color[2])
-                draw.rectangle([
-                    seg_x - 20, seg_y - 15,
-                    seg_x + segment_width + 20, seg_y + segment_height + 15
-                ], fill=contrast_color)
-                
-                # Draw segment text
-                draw.text((seg_x, seg_y), segment_text, fill=gradient_color, font=small_font)
-                
-                # Add color theme name in top-right
-                color_name = color_scheme["name"]
-                color_bbox = draw.textbbox((0, 0), color_name, font=small_font)
-                color_width = color_bbox[2] - color_bbox[0]
-                color_height = color_bbox[3] - color_bbox[1]
-                
-                color_x = img.width - color_width - margin
-                color_y = margin
-                
-                # Semi-transparent background
-                draw.rectangle([
-                    color_x - 15, color_y - 10,
-                    color_x + color_width + 15, color_y + color_height + 10
-                ], fill=(0, 0, 0, 150))
-                
-                draw.text((color_x, color_y), color_name, fill=gradient_color, font=small_font)
-                
-                # Save the customized thumbnail
-                thumbnail_path = self.output_dir / f"thumbnail_{i+1:03d}.png"
-                img.save(thumbnail_path, "PNG")
-                thumbnails.append(str(thumbnail_path))
-                
-            except Exception as e:
-                print(f"Failed to generate custom thumbnail {i+1}: {e}")
-                thumbnails.append(None)
+        # Segments are independent and PIL's decode/filter/encode work releases
+        # the GIL, so render them on threads (no worker process start-up)
+        workers = min(len(segments), os.cpu_count() or 1) or 1
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            thumbnails = list(executor.map(
+                _make_thumb, range(len(segments)), segments, repeat(base_bytes),
+                repeat(self.output_dir), repeat(self.optimize_images)
+            ))
         
         print(f"✅ Generated {len([t for t in thumbnails if t])} visually distinct thumbnails")
         return thumbnails
     
-    def _format_timestamp(self, seconds):
-        """Format seconds as MM:SS or HH:MM:SS"""
-        if seconds < 3600:
-            return f"{int(seconds // 60):02d}:{int(seconds % 60):02d}"
-        else:
-            hours = int(seconds // 3600)
-            minutes = int((seconds % 3600) // 60)
-            secs = int(seconds % 60)
-            return f"{hours:02d}:{minutes:02d}:{secs:02d}"
+    _format_timestamp = staticmethod(_format_timestamp)
+
+def format_timestamps(seconds_arr):
+    """Format many second offsets as MM:SS or HH:MM:SS in one array pass"""
+    a = np.asarray(seconds_arr, dtype=np.float64).astype(np.int64)
+    if a.size == 0:
+        return []
+    h = np.char.zfill((a // 3600).astype(str), 2)
+    m = np.char.zfill(((a % 3600) // 60).astype(str), 2)
+    s = np.char.zfill((a % 60).astype(str), 2)
+    mm_ss = np.char.add(np.char.add(m, ':'), s)
+    out = np.where(a < 3600, mm_ss, np.char.add(np.char.add(h, ':'), mm_ss))
+    return out.tolist()
+
+# Static page assets (head/tail templates, stylesheet and player script)
+TEMPLATES_DIR = Path(__file__).resolve().parent / "templates"
+STATIC_ASSETS = ("styles.css", "player.js")
+
+@functools.lru_cache(maxsize=None)
+def _load_template(name):
+    """Read a template file from TEMPLATES_DIR once per process"""
+    return (TEMPLATES_DIR / name).read_text(encoding='utf-8')
+
+@functools.lru_cache(maxsize=None)
+def _card_template():
+    """Highlight card markup as a string.Template, compiled once"""
+    return string.Template(_load_template("card.html"))
 
 class HTMLGenerator:
     """Generate the final HTML page"""
     
     def __init__(self, output_dir):
         self.output_dir = Path(output_dir)
+        self.head = _load_template("head.html")
+        self.tail = _load_template("tail.html")
     
     def generate(self, youtube_url, video_title, description, segments, thumbnails):
         """Generate the HTML highlight page"""
         video_id = self._extract_video_id(youtube_url)
         
-        html_content = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{description} - Video Highlights</title>
-    <style>
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-        
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-            padding: 20px;
-        }}
-        
-        .container {{
-            max-width: 1200px;
-            margin: 0 auto;
-        }}
-        
-        .header {{
-            text-align: center;
-            margin-bottom: 40px;
-            color: white;
-        }}
-        
-        .header h1 {{
-            font-size: 2.5rem;
-            margin-bottom: 10px;
-            text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
-        }}
-        
-        .header p {{
-            font-size: 1.2rem;
-            opacity: 0.9;
-        }}
-        
-        .video-container {{
-            margin-bottom: 40px;
-            text-align: center;
-        }}
-        
-        .video-wrapper {{
-            position: relative;
-            padding-bottom: 56.25%;
-            height: 0;
-            overflow: hidden;
-            border-radius: 12px;
-            box-shadow: 0 10px 30px rgba(0,0,0,0.3);
-        }}
-        
-        .video-wrapper iframe {{
-            position: absolute;
-            top: 0;
-            left: 0;
-            width: 100%;
-            height: 100%;
-            border: none;
-        }}
-        
-        .highlights-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
-            gap: 25px;
-            margin-top: 40px;
-        }}
-        
-        .highlight-card {{
-            background: rgba(255, 255, 255, 0.1);
-            backdrop-filter: blur(10px);
-            border-radius: 16px;
-            padding: 20px;
-            border: 1px solid rgba(255, 255, 255, 0.2);
-            transition: all 0.3s ease;
-            color: white;
-            cursor: pointer;
-            position: relative;
-        }}
-        
-        .highlight-card:hover {{
-            transform: translateY(-5px);
-            background: rgba(255, 255, 255, 0.15);
-            box-shadow: 0 15px 35px rgba(0,0,0,0.2);
-        }}
-        
-        .highlight-card:active {{
-            transform: translateY(-3px);
-        }}
-        
-        .thumbnail {{
-            width: 100%;
-            height: 180px;
-            object-fit: cover;
-            border-radius: 8px;
-            margin-bottom: 15px;
-        }}
-        
-        .placeholder-thumbnail {{
-            width: 100%;
-            height: 180px;
-            background: linear-gradient(45deg, #667eea, #764ba2);
-            border-radius: 8px;
-            margin-bottom: 15px;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            font-size: 3rem;
-            opacity: 0.7;
-        }}
-        
-        .summary {{
-            font-size: 1rem;
-            line-height: 1.6;
-            margin-bottom: 15px;
-            min-height: 80px;
-        }}
-        
-        .timestamp {{
-            font-size: 0.9rem;
-            opacity: 0.8;
-            margin-bottom: 10px;
-        }}
-        
-        .watch-btn {{
-            display: inline-block;
-            background: linear-gradient(135deg, #ff6b6b, #ee5a24);
-            color: white;
-            text-decoration: none;
-            padding: 10px 20px;
-            border-radius: 25px;
-            font-weight: 600;
-            transition: all 0.3s ease;
-            box-shadow: 0 4px 15px rgba(238, 90, 36, 0.3);
-        }}
+        parts = [self.head.format(description=description, video_id=video_id)]
         
-        .watch-btn:hover {{
-            transform: translateY(-2px);
-            box-shadow: 0 6px 20px rgba(238, 90, 36, 0.4);
-        }}
-        
-        .youtube-thumbnail {{
-            width: 100%;
-            height: 180px;
-            object-fit: cover;
-            border-radius: 8px;
-            margin-bottom: 15px;
-        }}
-        
-        .watch-btn {{
-            background: none;
-            border: none;
-            font: inherit;
-            cursor: pointer;
-        }}
-        
-        .footer {{
-            text-align: center;
-            margin-top: 60px;
-            color: rgba(255, 255, 255, 0.7);
-            font-size: 0.9rem;
-        }}
-        
-        @media (max-width: 768px) {{
-            .header h1 {{
-                font-size: 2rem;
-            }}
-            
-            .highlights-grid {{
-                grid-template-columns: 1fr;
-            }}
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>{description}</h1>
-            <p>Key highlights from the video</p>
-        </div>
-        
-        <div class="video-container">
-            <div class="video-wrapper">
-                <iframe id="youtube-player" src="https://www.youtube.com/embed/{video_id}?enablejsapi=1" 
-                        allowfullscreen></iframe>
-            </div>
-        </div>
-        
-        <div class="highlights-grid">
-"""
+        # List the output directory once instead of stat-ing each thumbnail
+        try:
+            with os.scandir(self.output_dir) as entries:
+                existing = {e.name for e in entries if e.is_file()}
+        except OSError:
+            existing = set()
         
         # Add highlight cards
         # Ensure thumbnails list is at least as long as segments
         thumbnails_padded = thumbnails + [None] * (len(segments) - len(thumbnails))
+        card_tmpl = _card_template()
+        timestamps = format_timestamps([segment['start'] for segment in segments])
         
         for i, segment in enumerate(segments):
             start_time = int(segment['start'])
-            timestamp_display = self._format_timestamp(segment['start'])
+            timestamp_display = timestamps[i]
             thumbnail = thumbnails_padded[i] if i < len(thumbnails_padded) else None
             
             # Use local thumbnail if available, otherwise fallback to YouTube API
-            if thumbnail and Path(thumbnail).exists():
+            if thumbnail and Path(thumbnail).name in existing:
                 thumbnail_html = f'<img src="{Path(thumbnail).name}" alt="Thumbnail {i+1}" class="thumbnail">'
             else:
                 # Use YouTube's thumbnail API as final fallback
                 youtube_thumb_url = f"https://img.youtube.com/vi/{video_id}/maxresdefault.jpg"
                 thumbnail_html = f'<img src="{youtube_thumb_url}" alt="Thumbnail {i+1}" class="youtube-thumbnail">'
             
-            html_content += f"""
-            <div class="highlight-card" data-timestamp="{start_time}">
-                {thumbnail_html}
-                <div class="summary">{segment.get('summary', segment['text'][:200] + '...')}</div>
-                <div class="timestamp">Starts at {timestamp_display}</div>
-                <button class="watch-btn">Watch Segment</button>
-            </div>
-"""
-        
-        html_content += """
-        </div>
-        
-        <div class="footer">
-            <p>Generated with YouTube Highlight Generator</p>
-        </div>
-    </div>
-    
-    <script>
-        let player;
-        let playerReady = false;
-        
-        // Load YouTube IFrame API
-        const tag = document.createElement('script');
-        tag.src = "https://www.youtube.com/iframe_api";
-        const firstScriptTag = document.getElementsByTagName('script')[0];
-        firstScriptTag.parentNode.insertBefore(tag, firstScriptTag);
+            parts.append(card_tmpl.substitute(
+                ts=start_time,
+                thumb=thumbnail_html,
+                summary=segment.get('summary', segment['text'][:200] + '...'),
+                ts_disp=timestamp_display,
+            ))
         
-        // YouTube API callback
-        function onYouTubeIframeAPIReady() {
-            player = new YT.Player('youtube-player', {
-                events: {
-                    'onReady': onPlayerReady,
-                    'onError': onPlayerError
-                }
-            });
-        }
+        parts.append(self.tail)
         
-        function onPlayerReady(event) {
-            playerReady = true;
-            console.log('YouTube player ready');
-            setupCardClickHandlers();
-        }
-        
-        function onPlayerError(event) {
-            console.error('YouTube player error:', event.data);
-            // Fall back to basic method
-            playerReady = false;
-        }
-        
-        function seekToTime(seconds) {
-            console.log('Seeking to:', seconds, 'seconds');
-            
-            if (playerReady && player && player.seekTo) {
-                // Use YouTube API
-                player.seekTo(seconds, true);
-                player.playVideo();
-            } else {
-                // Fallback: reload iframe with timestamp
-                const iframe = document.getElementById('youtube-player');
-                const src = iframe.src;
-                const baseUrl = src.split('?')[0];
-                iframe.src = baseUrl + '?enablejsapi=1&start=' + seconds + '&autoplay=1';
-            }
-            
-            // Smooth scroll to video
-            document.querySelector('.video-container').scrollIntoView({
-                behavior: 'smooth',
-                block: 'center'
-            });
-        }
-        
-        function setupCardClickHandlers() {
-            // Make entire cards clickable
-            document.querySelectorAll('.highlight-card').forEach(card => {
-                card.addEventListener('click', function(e) {
-                    // Don't trigger if clicking a link inside the card
-                    if (e.target.tagName === 'A') return;
-                    
-                    const timestamp = parseInt(this.getAttribute('data-timestamp'));
-                    if (!isNaN(timestamp)) {
-                        seekToTime(timestamp);
-                    }
-                });
-            });
-        }
-        
-        // Set up handlers when DOM is ready
-        document.addEventListener('DOMContentLoaded', function() {
-            // Try to set up handlers immediately
-            setupCardClickHandlers();
-            
-            // Also try again after a delay in case player loads slowly
-            setTimeout(setupCardClickHandlers, 2000);
-        });
-    </script>
-</body>
-</html>
-"""
-        
-        # Save HTML file
+        # Save HTML file in a single buffered write
         html_path = self.output_dir / "index.html"
-        with open(html_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        with open(html_path, 'wb', buffering=1024 * 1024) as f:
+            f.write(''.join(parts).encode('utf-8'))
+        self._install_assets()
         
         print(f"✅ HTML page generated: {html_path}")
         return str(html_path)
     
-    def _extract_video_id(self, youtube_url):
-        """Extract video ID from YouTube URL"""
-        patterns = [
-            r'(?:youtube\.com/watch\?v=|youtu\.be/|youtube\.com/embed/)([^&\n?#]+)',
-            r'youtube\.com/v/([^&\n?#]+)',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, youtube_url)
-            if match:
-                return match.group(1)
-        return "unknown"
+    def _install_assets(self):
+        """Copy the static stylesheet and player script next to index.html"""
+        for name in STATIC_ASSETS:
+            src = TEMPLATES_DIR / name
+            dest = self.output_dir / name
+            if not dest.exists() or dest.stat().st_mtime < src.stat().st_mtime:
+                shutil.copyfile(src, dest)
     
-    def _format_timestamp(self, seconds):
-        """Format seconds as MM:SS or HH:MM:SS"""
-        if seconds < 3600:
-            return f"{int(seconds // 60):02d}:{int(seconds % 60):02d}"
-        else:
-            hours = int(seconds // 3600)
-            minutes = int((seconds % 3600) // 60)
-            secs = int(seconds % 60)
-            return f"{hours:02d}:{minutes:02d}:{secs:02d}"
+    _extract_video_id = staticmethod(_extract_video_id)
+    _format_timestamp = staticmethod(_format_timestamp)
 
 def main():
     parser = argparse.ArgumentParser(description="Generate YouTube video highlights")
@@ -994,6 +969,7 @@ def main():
     parser.add_argument("--keywords", nargs="+", default=["introduction", "conclusion"], help="Keywords to find interesting segments")
     parser.add_argument("--cards", type=int, default=4, help="Number of highlight cards to generate")
     parser.add_argument("--output-dir", default="output", help="Output directory")
+    parser.add_argument("--no-optimize", action="store_true", help="Skip optipng/jpegoptim post-processing of thumbnails")
     
     args = parser.parse_args()
     
@@ -1038,11 +1014,12 @@ def main():
     
     # Summarize segments
     print("📝 Summarizing segments...")
-    for segment in interesting_segments:
-        segment['summary'] = summarizer.summarize(segment['text'])
+    summaries = summarizer.summarize_batch([segment['text'] for segment in interesting_segments])
+    for segment, summary in zip(interesting_segments, summaries):
+        segment['summary'] = summary
     
     # Process video
-    video_processor = VideoProcessor(args.output_dir)
+    video_processor = VideoProcessor(args.output_dir, optimize_images=not args.no_optimize)
     video_path, video_title = video_processor.download_video(args.youtube_url)
     
     # Always try to extract/generate thumbnails
@@ -1066,9 +1043,9 @@ def main():
     
     # Show segment info
     print(f"\n📊 Generated {len(interesting_segments)} highlight cards:")
+    timestamps = format_timestamps([segment['start'] for segment in interesting_segments])
     for i, segment in enumerate(interesting_segments):
-        timestamp = video_processor._format_timestamp if hasattr(video_processor, '_format_timestamp') else HTMLGenerator(args.output_dir)._format_timestamp
-        print(f"  {i+1}. {timestamp(segment['start'])} - {segment.get('keyword', 'general')}")
+        print(f"  {i+1}. {timestamps[i]} - {segment.get('keyword', 'general')}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -5,27 +5,142 @@ Improved AI Summarizer with better readability and conciseness
 
 import os
 import re
+import heapq
+import logging
 import sys
+import mmap
+import shutil
 from pathlib import Path
 
-# Set environment variable to avoid tokenizers parallelism warnings
-os.environ["TOKENIZERS_PARALLELISM"] = "false"
+# Keep Rust-side parallel tokenization on for batched encoding (unless the user chose)
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "true")
 
 # Try to import transformers
 try:
-    from transformers import pipeline
+    from transformers import pipeline, AutoTokenizer, AutoModelForSeq2SeqLM
     import torch
     HAS_TRANSFORMERS = True
 except ImportError:
     HAS_TRANSFORMERS = False
 
+# Try to import numba for the sentence scoring kernel
+try:
+    import numpy as np
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+MODEL_NAME = "facebook/bart-large-cnn"
+
+# Precompiled patterns used by the cleaning and scoring helpers
+# Every whitespace character (all of them sit below U+3001) maps to a plain space
+_WS_TABLE = str.maketrans({chr(cp): ' ' for cp in range(0x3001) if chr(cp).isspace()})
+_MULTI_WS = re.compile(r' {2,}')
+# Filler words/phrases, bracket annotations and parenthetical asides, in one pass
+_FILLER_RE = re.compile(
+    r'\b(?:um|uh|ah|er|like|you know|sort of|kind of|basically|actually)\b'
+    r'|\b(?:so|well|yeah|okay|right|now)\s+'
+    r'|\[[^\]]*\]'  # Bracket annotations
+    r'|\([^)]*\)',  # Parenthetical asides
+    re.IGNORECASE
+)
+# Space before punctuation and runs of punctuation, collapsed to one mark
+_PUNCT_RE = re.compile(r'\s*([.!?])(?:\s*[.!?])*')
+_SENT_SPLIT = re.compile(r'[.!?]+')
+_DIGIT_RE = re.compile(r'\d+')
+_PROPER_RE = re.compile(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b')  # Proper nouns
+_TECH_RE = re.compile(r'\b(?:AI|ML|API|GPU|CPU|algorithm|model|system|technology)\b', re.IGNORECASE)
+_CONJ_RE = re.compile(r'\b(and|or|but|so|because|since|while|although)\b', re.IGNORECASE)
+
+# Content scoring - words that indicate key information
+KEY_INDICATORS = [
+    'introduce', 'present', 'show', 'demonstrate', 'explain',
+    'important', 'key', 'main', 'primary', 'significant',
+    'first', 'second', 'finally', 'conclusion', 'result',
+    'because', 'therefore', 'however', 'but', 'although',
+    'new', 'revolutionary', 'breakthrough', 'innovative',
+    'problem', 'solution', 'challenge', 'opportunity'
+]
+
+# Sentence feature columns produced by _featurize
+F_LEN, F_DIGIT, F_PROPER, F_TECH, F_KEY, F_CONJ = range(6)
+
+def _featurize(sentence):
+    """Reduce a sentence to the integer features used for scoring"""
+    sentence_lower = sentence.lower()
+    return (
+        len(sentence),
+        1 if _DIGIT_RE.search(sentence) else 0,
+        1 if _PROPER_RE.search(sentence) else 0,
+        1 if _TECH_RE.search(sentence) else 0,
+        sum(1 for indicator in KEY_INDICATORS if indicator in sentence_lower),
+        len(_CONJ_RE.findall(sentence_lower)),
+    )
+
+def _score_features(feats, out):
+    """Write a readability/importance score for each feature row into out"""
+    n = len(feats)
+    for i in range(n):
+        row = feats[i]
+        score = 0
+        
+        # Position scoring (beginning and end are important)
+        if i == 0:
+            score += 3  # First sentence often contains key info
+        elif i == n - 1:
+            score += 2  # Last sentence often contains conclusions
+        elif i == 1:
+            score += 1  # Second sentence often expands on the topic
+        
+        score += 2 * row[F_KEY]
+        
+        # Prefer sentences with numbers, proper nouns, or technical terms
+        score += row[F_DIGIT] + row[F_PROPER] + 2 * row[F_TECH]
+        
+        # Penalty for very long sentences (harder to read)
+        if row[F_LEN] > 150:
+            score -= 1
+        
+        # Penalty for sentences with too many conjunctions (rambling)
+        if row[F_CONJ] > 2:
+            score -= row[F_CONJ]
+        
+        out[i] = score
+
+if HAS_NUMBA:
+    _score_features_jit = njit(cache=True)(_score_features)
+
+# Loaded pipelines keyed by (model, device), shared by all summarizer instances
+_PIPELINE_CACHE = {}
+
 class ImprovedSummarizer:
     """Enhanced AI-powered text summarization with focus on readability"""
     
+    # Below this many sentences the JIT call overhead isn't worth it
+    NUMBA_MIN_SENTENCES = 64
+    
     def __init__(self):
         self.summarizer = None
+        self._tokenizer = None
         self._init_model()
     
+    @staticmethod
+    def _load_model(**kwargs):
+        """Load the seq2seq model on the fused SDPA attention path when supported"""
+        # Quiet load-time notices only; warnings during summarization still show
+        logger = logging.getLogger("transformers")
+        level = logger.level
+        logger.setLevel(logging.ERROR)
+        try:
+            try:
+                return AutoModelForSeq2SeqLM.from_pretrained(MODEL_NAME, attn_implementation="sdpa", **kwargs)
+            except (TypeError, ValueError):
+                # Older transformers releases don't know attn_implementation
+                return AutoModelForSeq2SeqLM.from_pretrained(MODEL_NAME, **kwargs)
+        finally:
+            logger.setLevel(level)
+    
     def _init_model(self):
         """Initialize the summarization model with better parameters"""
         if not HAS_TRANSFORMERS:
@@ -33,19 +148,48 @@ class ImprovedSummarizer:
             self.summarizer = None
             return
             
+        device = 0 if torch.cuda.is_available() else -1
+        key = (MODEL_NAME, device)
+        self.summarizer = _PIPELINE_CACHE.get(key)
+        if self.summarizer is not None:
+            self._tokenizer = self.summarizer.tokenizer
+            return
+            
         try:
             print("🤖 Loading enhanced AI summarization model...")
+            tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME, use_fast=True)
+            if device == 0:
+                # Inference only: half precision halves weight memory and speeds up GPU matmuls
+                dtype = torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+                model = self._load_model(torch_dtype=dtype).to("cuda")
+            else:
+                # CPU: dynamic int8 quantization of the Linear layers
+                model = self._load_model()
+                model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
             self.summarizer = pipeline(
                 "summarization",
-                model="facebook/bart-large-cnn",
-                device=0 if torch.cuda.is_available() else -1
+                model=model,
+                tokenizer=tokenizer,
+                device=device
             )
+            _PIPELINE_CACHE[key] = self.summarizer
+            self._tokenizer = self.summarizer.tokenizer
             print("✅ Enhanced AI model loaded successfully!")
         except Exception as e:
             print(f"⚠️  AI model failed to load: {e}")
             print("Using enhanced extractive summarization")
             self.summarizer = None
     
+    def _generation_max_length(self, texts):
+        """Cap generated tokens from the longest input's real token count"""
+        if self._tokenizer is None:
+            return min(60, max(len(t.split()) for t in texts) + 20)
+        n_tok = max(
+            len(self._tokenizer.encode(t, add_special_tokens=False, truncation=True))
+            for t in texts
+        )
+        return min(60, n_tok // 2 + 15)
+    
     def summarize(self, text, max_length=80, target_sentences=1):
         """
         Create concise, readable summaries
@@ -61,17 +205,23 @@ class ImprovedSummarizer:
         # Clean input text first
         clean_text = self._clean_text(text)
         
+        # Text already close to the target length isn't worth a model call
+        if 0 < len(clean_text) <= int(max_length * 1.2):
+            return self._truncate_sentence(clean_text, max_length)
+        
         if self.summarizer and len(clean_text) > 50:
             try:
                 # Use AI with better parameters
-                result = self.summarizer(
-                    clean_text,
-                    max_length=min(60, len(clean_text.split()) + 20),  # Adaptive max length
-                    min_length=15,
-                    do_sample=False,
-                    truncation=True,
-                    clean_up_tokenization_spaces=True
-                )
+                with torch.inference_mode():
+                    result = self.summarizer(
+                        clean_text,
+                        max_length=self._generation_max_length([clean_text]),  # Adaptive max length
+                        min_length=15,
+                        num_beams=1,
+                        do_sample=False,
+                        truncation=True,
+                        clean_up_tokenization_spaces=True
+                    )
                 
                 summary = result[0]['summary_text'].strip()
                 
@@ -85,29 +235,73 @@ class ImprovedSummarizer:
         # Enhanced extractive summarization
         return self._enhanced_extractive_summary(clean_text, max_length, target_sentences)
     
+    def summarize_batch(self, texts, max_length=80, target_sentences=1):
+        """
+        Summarize several texts with a single batched model call
+        
+        Args:
+            texts: List of input texts
+            max_length: Maximum characters in each summary
+            target_sentences: Preferred number of sentences
+            
+        Returns:
+            List of summaries in the same order as texts
+        """
+        summaries = [None] * len(texts)
+        model_inputs = []  # (index, cleaned text) pairs for the model
+        
+        for i, text in enumerate(texts):
+            if not text or len(text.strip()) < 20:
+                summaries[i] = self._clean_text(text)
+                continue
+            
+            clean_text = self._clean_text(text)
+            if 0 < len(clean_text) <= int(max_length * 1.2):
+                summaries[i] = self._truncate_sentence(clean_text, max_length)
+            elif self.summarizer and len(clean_text) > 50:
+                model_inputs.append((i, clean_text))
+            else:
+                summaries[i] = self._enhanced_extractive_summary(clean_text, max_length, target_sentences)
+        
+        if model_inputs:
+            batch = [clean_text for _, clean_text in model_inputs]
+            try:
+                with torch.inference_mode():
+                    results = self.summarizer(
+                        batch,
+                        batch_size=len(batch),
+                        max_length=self._generation_max_length(batch),  # Adaptive max length
+                        min_length=15,
+                        num_beams=1,
+                        do_sample=False,
+                        truncation=True,
+                        clean_up_tokenization_spaces=True
+                    )
+                
+                for (i, _), result in zip(model_inputs, results):
+                    summaries[i] = self._post_process_summary(result['summary_text'].strip(), max_length)
+                    
+            except Exception as e:
+                print(f"AI summarization failed: {e}")
+                for i, clean_text in model_inputs:
+                    summaries[i] = self._enhanced_extractive_summary(clean_text, max_length, target_sentences)
+        
+        return summaries
+    
     def _clean_text(self, text):
         """Clean and normalize input text"""
         if not text:
             return ""
             
-        # Remove excessive whitespace
-        text = re.sub(r'\s+', ' ', text.strip())
+        # Normalize whitespace to single spaces
+        text = _MULTI_WS.sub(' ', text.translate(_WS_TABLE)).strip()
         
         # Remove filler words and phrases common in transcripts
-        filler_patterns = [
-            r'\b(um|uh|ah|er|like|you know|sort of|kind of|basically|actually)\b',
-            r'\b(so|well|yeah|okay|right|now)\s+',
-            r'\[.*?\]',  # Remove bracket annotations
-            r'\(.*?\)',  # Remove parenthetical asides
-        ]
-        
-        for pattern in filler_patterns:
-            text = re.sub(pattern, ' ', text, flags=re.IGNORECASE)
+        text = _FILLER_RE.sub(' ', text)
         
-        # Clean up punctuation
-        text = re.sub(r'\s+([.!?])', r'\1', text)  # Remove space before punctuation
-        text = re.sub(r'([.!?])\s*([.!?])+', r'\1', text)  # Remove duplicate punctuation
-        text = re.sub(r'\s+', ' ', text).strip()
+        # Clean up punctuation: drop space before it and duplicate marks
+        text = _PUNCT_RE.sub(r'\1', text)
+        text = _MULTI_WS.sub(' ', text).strip()
         
         return text
     
@@ -124,7 +318,7 @@ class ImprovedSummarizer:
         
         # Truncate if too long while preserving sentence structure
         if len(summary) > max_length:
-            sentences = re.split(r'[.!?]+', summary)
+            sentences = _SENT_SPLIT.split(summary)
             result = ""
             
             for sentence in sentences:
@@ -144,7 +338,7 @@ class ImprovedSummarizer:
     def _enhanced_extractive_summary(self, text, max_length, target_sentences):
         """Enhanced extractive summarization with better sentence selection"""
         
-        sentences = re.split(r'[.!?]+', text)
+        sentences = _SENT_SPLIT.split(text)
         sentences = [s.strip() for s in sentences if len(s.strip()) > 15]
         
         if not sentences:
@@ -154,60 +348,19 @@ class ImprovedSummarizer:
             return self._truncate_sentence(sentences[0], max_length)
         
         # Score sentences with enhanced criteria
-        scored_sentences = []
-        
-        for i, sentence in enumerate(sentences):
-            score = 0
-            sentence_lower = sentence.lower()
-            
-            # Position scoring (beginning and end are important)
-            if i == 0:
-                score += 3  # First sentence often contains key info
-            elif i == len(sentences) - 1:
-                score += 2  # Last sentence often contains conclusions
-            elif i == 1:
-                score += 1  # Second sentence often expands on the topic
-            
-            # Content scoring - look for key indicators
-            key_indicators = [
-                'introduce', 'present', 'show', 'demonstrate', 'explain',
-                'important', 'key', 'main', 'primary', 'significant',
-                'first', 'second', 'finally', 'conclusion', 'result',
-                'because', 'therefore', 'however', 'but', 'although',
-                'new', 'revolutionary', 'breakthrough', 'innovative',
-                'problem', 'solution', 'challenge', 'opportunity'
-            ]
-            
-            for indicator in key_indicators:
-                if indicator in sentence_lower:
-                    score += 2
-            
-            # Prefer sentences with numbers, proper nouns, or technical terms
-            if re.search(r'\d+', sentence):
-                score += 1
-            if re.search(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b', sentence):  # Proper nouns
-                score += 1
-            if re.search(r'\b(?:AI|ML|API|GPU|CPU|algorithm|model|system|technology)\b', sentence, re.IGNORECASE):
-                score += 2
-            
-            # Penalty for very long sentences (harder to read)
-            if len(sentence) > 150:
-                score -= 1
-            
-            # Penalty for sentences with too many conjunctions (rambling)
-            conjunctions = len(re.findall(r'\b(and|or|but|so|because|since|while|although)\b', sentence_lower))
-            if conjunctions > 2:
-                score -= conjunctions
-            
-            scored_sentences.append((score, sentence, len(sentence)))
+        scores = self._score_sentences(sentences)
+        scored_sentences = [
+            (score, sentence, len(sentence)) for score, sentence in zip(scores, sentences)
+        ]
         
-        # Sort by score and select best sentences
-        scored_sentences.sort(key=lambda x: x[0], reverse=True)
+        # Select best sentences, ranking only the top few up front
+        top_k = target_sentences * 3
+        top = heapq.nlargest(top_k, scored_sentences, key=lambda x: x[0])
         
         selected_sentences = []
         total_length = 0
         
-        for score, sentence, length in scored_sentences:
+        for score, sentence, length in self._ranked(top, scored_sentences, top_k):
             if len(selected_sentences) >= target_sentences and total_length >= max_length * 0.7:
                 break
                 
@@ -217,7 +370,7 @@ class ImprovedSummarizer:
         
         # If no sentences fit, take the best one and truncate
         if not selected_sentences:
-            best_sentence = scored_sentences[0][1]
+            best_sentence = top[0][1]
             return self._truncate_sentence(best_sentence, max_length)
         
         # Join sentences and ensure proper formatting
@@ -227,6 +380,30 @@ class ImprovedSummarizer:
         
         return result
     
+    @staticmethod
+    def _ranked(top, scored_sentences, top_k):
+        """Yield the top-k candidates, then the rest in rank order if still needed"""
+        yield from top
+        if len(scored_sentences) > top_k:
+            # Rarely reached: only when the top candidates didn't fill the summary
+            yield from sorted(scored_sentences, key=lambda x: x[0], reverse=True)[top_k:]
+    
+    def _score_sentences(self, sentences):
+        """Score sentences for extractive selection (JIT-compiled when numba is available)"""
+        feats = [_featurize(sentence) for sentence in sentences]
+        
+        if HAS_NUMBA and len(sentences) >= self.NUMBA_MIN_SENTENCES:
+            try:
+                scores = np.zeros(len(feats), dtype=np.int64)
+                _score_features_jit(np.array(feats, dtype=np.int32), scores)
+                return scores.tolist()
+            except Exception as e:
+                print(f"Numba sentence scoring failed, using Python: {e}")
+        
+        scores = [0] * len(feats)
+        _score_features(feats, scores)
+        return scores
+    
     def _truncate_sentence(self, sentence, max_length):
         """Truncate a sentence intelligently at word boundaries"""
         if len(sentence) <= max_length:
@@ -244,17 +421,25 @@ class ImprovedSummarizer:
         
         return ' '.join(result) + '...' if result else sentence[:max_length-3] + '...'
 
+# Byte patterns used when rewriting generate_video_cards.py in place
+_IMPORT_SECTION_RE = re.compile(rb'# Video and AI processing.*?sys\.exit\(1\)', re.DOTALL)
+
+def _atomic_write(path, data):
+    """Write bytes to a sibling temp file and rename it over path"""
+    tmp = path.with_suffix(path.suffix + '.tmp')
+    with open(tmp, 'wb', buffering=1024 * 1024) as f:
+        f.write(data)
+    shutil.copymode(path, tmp)
+    os.replace(tmp, path)
+
 def update_existing_files():
     """Update the main generate_video_cards.py to use improved summarizer"""
     
     main_file = Path("generate_video_cards.py")
     one_command_file = Path("one_command_highlights.py")
     
-    # Read the current files
-    if main_file.exists():
-        with open(main_file, 'r') as f:
-            content = f.read()
-        
+    # Rewrite the main file from a read-only mapping
+    if main_file.exists() and main_file.stat().st_size:
         # Replace the AISummarizer class with our improved version
         # Find the class definition
         import_section = """# Video and AI processing
@@ -270,23 +455,18 @@ try:
 except ImportError as e:
     print(f"❌ Missing required package: {e}")
     print("Run: pip3 install --user pytube moviepy transformers torch pillow numpy requests")
-    sys.exit(1)"""
-        
-        # Replace import section
-        content = re.sub(
-            r'# Video and AI processing.*?sys\.exit\(1\)',
-            import_section,
-            content,
-            flags=re.DOTALL
-        )
+    sys.exit(1)""".encode('utf-8')
+        
+        with open(main_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # Replace import section
+            content = _IMPORT_SECTION_RE.sub(lambda m: import_section, mm)
         
         # Replace AISummarizer with ImprovedSummarizer
-        content = content.replace('class AISummarizer:', 'class AISummarizer(ImprovedSummarizer):')
-        content = content.replace('AISummarizer()', 'ImprovedSummarizer()')
+        content = content.replace(b'class AISummarizer:', b'class AISummarizer(ImprovedSummarizer):')
+        content = content.replace(b'AISummarizer()', b'ImprovedSummarizer()')
         
-        # Write back
-        with open(main_file, 'w') as f:
-            f.write(content)
+        # Write back atomically
+        _atomic_write(main_file, content)
         
         print("✅ Updated generate_video_cards.py")
     
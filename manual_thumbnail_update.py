@@ -4,6 +4,13 @@ Manually update HTML to use different YouTube thumbnail variants
 This creates visual variety without needing external tools
 """
 
+import os
+import mmap
+import re
+
+# Matches the local thumbnail references the generator writes for the first four cards
+_THUMB_SRC_RE = re.compile(rb'src="thumbnail_00([1-4])\.png"')
+
 def update_html_with_youtube_variants():
     """Update HTML to use different YouTube thumbnail variants for visual variety"""
     
@@ -18,24 +25,23 @@ def update_html_with_youtube_variants():
         f"https://img.youtube.com/vi/{video_id}/sddefault.jpg",        # Segment 4 - Standard def
     ]
     
-    with open(html_file, 'r') as f:
-        content = f.read()
-    
-    # Replace each thumbnail with different variant
-    replacements = [
-        ('src="thumbnail_001.png"', f'src="{thumbnail_variants[0]}"'),
-        ('src="thumbnail_002.png"', f'src="{thumbnail_variants[1]}"'),
-        ('src="thumbnail_003.png"', f'src="{thumbnail_variants[2]}"'),  
-        ('src="thumbnail_004.png"', f'src="{thumbnail_variants[3]}"'),
-    ]
+    mapping = {str(i + 1).encode(): f'src="{url}"'.encode() for i, url in enumerate(thumbnail_variants)}
     
-    for old, new in replacements:
-        content = content.replace(old, new)
-        print(f"✅ Updated: {old} -> {new}")
+    # Replace every thumbnail reference in a single pass over the mapped HTML
+    with open(html_file, 'r+b') as f:
+        # mmap can't map an empty file; there is nothing to replace in one anyway
+        if os.fstat(f.fileno()).st_size == 0:
+            count = 0
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                content, count = _THUMB_SRC_RE.subn(lambda m: mapping[m.group(1)], mm)
+            f.seek(0)
+            f.write(content)
+            f.truncate()
     
-    # Save updated HTML
-    with open(html_file, 'w') as f:
-        f.write(content)
+    for i, url in enumerate(thumbnail_variants):
+        print(f"✅ Updated: src=\"thumbnail_00{i+1}.png\" -> src=\"{url}\"")
+    print(f"✅ {count} thumbnail reference(s) replaced")
     
     print(f"✅ Updated HTML file: {html_file}")
     print("\nNow each segment uses a different YouTube thumbnail variant:")
@@ -5,81 +5,90 @@ Handles everything: transcript conversion, highlight generation, and screenshot
 """
 
 import os
+import re
 import sys
+import argparse
 import subprocess
 from pathlib import Path
 import json
 from datetime import datetime
-
-# Set environment variable to avoid tokenizers parallelism warnings
-os.environ["TOKENIZERS_PARALLELISM"] = "false"
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Import our existing modules
 from transcript_converter import convert_raw_transcript_to_vtt
 from improved_summarizer import ImprovedSummarizer
+from smart_thumbnail_extractor import resolve_stream_url
 from generate_video_cards import (
     TranscriptParser, SegmentFinder, VideoProcessor, HTMLGenerator
 )
 
-def one_command_highlights():
-    """Single command to create complete highlight page"""
+DEFAULT_KEYWORDS = ['introduction', 'conclusion', 'important', 'key', 'amazing', 'demo', 'show']
+
+def one_command_highlights(youtube_url=None, raw_transcript=None, title=None,
+                           keywords=None, num_cards=None, output_dir=None):
+    """Single command to create complete highlight page
+    
+    Prompts interactively unless both the URL and the transcript are given
+    (or the transcript is piped in on stdin).
+    """
+    interactive = not (youtube_url and raw_transcript)
     
     print("🚀 One-Command YouTube Highlight Generator")
     print("=" * 50)
     
     # Step 1: Get YouTube URL
-    youtube_url = input("📺 Enter YouTube URL: ").strip()
+    if not youtube_url:
+        youtube_url = input("📺 Enter YouTube URL: ").strip()
     if not youtube_url:
         print("❌ YouTube URL required")
         return
     
     # Step 2: Get raw transcript
-    print("\n📝 Paste your YouTube transcript below.")
-    print("(Any format - with or without timestamps)")
-    print("Press Enter twice when done:\n")
-    
-    lines = []
-    empty_count = 0
-    
-    while True:
+    if not raw_transcript:
+        if sys.stdin.isatty():
+            print("\n📝 Paste your YouTube transcript below.")
+            print("(Any format - with or without timestamps)")
+            print("Press Ctrl-D (Ctrl-Z then Enter on Windows) when done:\n")
+        else:
+            # Piped transcript: stdin is consumed, so use defaults for the rest
+            interactive = False
+        
+        # One bulk read, whether piped or pasted
         try:
-            line = input()
-            if line.strip() == "":
-                empty_count += 1
-                if empty_count >= 2:
-                    break
-            else:
-                empty_count = 0
-                lines.append(line)
-        except (EOFError, KeyboardInterrupt):
-            break
+            raw_transcript = sys.stdin.read()
+        except KeyboardInterrupt:
+            raw_transcript = ""
     
-    if not lines:
+    if not raw_transcript.strip():
         print("❌ No transcript provided")
         return
     
-    raw_transcript = '\n'.join(lines)
-    
     # Step 3: Get options
-    title = input("\n📰 Page title (or press Enter for auto-detect): ").strip()
-    
-    print("\n🔍 Keywords to find interesting segments:")
-    print("Examples: introduction, conclusion, demo, important, key, amazing")
-    keywords_input = input("Enter keywords (comma-separated) or press Enter for defaults: ").strip()
-    
-    if keywords_input:
-        keywords = [k.strip() for k in keywords_input.split(',')]
-    else:
-        keywords = ['introduction', 'conclusion', 'important', 'key', 'amazing', 'demo', 'show']
+    if interactive:
+        if title is None:
+            title = input("\n📰 Page title (or press Enter for auto-detect): ").strip()
+        
+        if keywords is None:
+            print("\n🔍 Keywords to find interesting segments:")
+            print("Examples: introduction, conclusion, demo, important, key, amazing")
+            keywords_input = input("Enter keywords (comma-separated) or press Enter for defaults: ").strip()
+            if keywords_input:
+                keywords = [k.strip() for k in keywords_input.split(',')]
+        
+        if num_cards is None:
+            num_cards_input = input("\n🎴 Number of highlight cards (default: 4): ").strip()
+            num_cards = int(num_cards_input) if num_cards_input.isdigit() and int(num_cards_input) > 0 else 4
     
-    num_cards_input = input("\n🎴 Number of highlight cards (default: 4): ").strip()
-    num_cards = int(num_cards_input) if num_cards_input.isdigit() else 4
+    keywords = keywords or DEFAULT_KEYWORDS
+    if num_cards is None:
+        num_cards = 4
     
     # Step 4: Create output directory
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    output_dir = f"highlights_{timestamp}"
+    if not output_dir:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_dir = f"highlights_{timestamp}"
     output_path = Path(output_dir)
-    output_path.mkdir(exist_ok=True)
+    output_path.mkdir(parents=True, exist_ok=True)
     
     print(f"\n📁 Creating output directory: {output_dir}")
     
@@ -110,17 +119,24 @@ def one_command_highlights():
         
         print(f"✅ Found {len(interesting_segments)} interesting segments")
         
-        # Step 8: AI Summarization
-        print("🤖 Generating AI summaries...")
-        summarizer = ImprovedSummarizer()
-        
-        for segment in interesting_segments:
-            segment['summary'] = summarizer.summarize(segment['text'])
-        
-        # Step 9: Process video and extract screenshots
-        print("📸 Processing video and extracting screenshots...")
+        # Steps 8 and 9 overlap: the (network-bound) video download runs in the
+        # background while the (compute-bound) summarizer works on the main thread
         video_processor = VideoProcessor(str(output_path))
-        video_path, video_title = video_processor.download_video(youtube_url)
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            print("📥 Downloading video in the background...")
+            download_future = pool.submit(video_processor.download_video, youtube_url)
+            
+            # Step 8: AI Summarization
+            print("🤖 Generating AI summaries...")
+            summarizer = ImprovedSummarizer()
+            
+            summaries = summarizer.summarize_batch([segment['text'] for segment in interesting_segments])
+            for segment, summary in zip(interesting_segments, summaries):
+                segment['summary'] = summary
+            
+            # Step 9: Process video and extract screenshots
+            print("📸 Processing video and extracting screenshots...")
+            video_path, video_title = download_future.result()
         
         # Always try to extract/generate thumbnails
         thumbnails = video_processor.extract_thumbnails(video_path, interesting_segments)
@@ -175,9 +191,10 @@ def one_command_highlights():
             print(f"  {i+1}. {minutes:02d}:{seconds:02d} - {keyword}")
         
         # Offer to open the file
-        open_now = input(f"\n🚀 Open the highlight page now? (y/n): ").strip().lower()
-        if open_now in ['y', 'yes']:
-            os.system(f'open "{html_path}"')
+        if interactive:
+            open_now = input(f"\n🚀 Open the highlight page now? (y/n): ").strip().lower()
+            if open_now in ['y', 'yes']:
+                os.system(f'open "{html_path}"')
         
         return output_dir
         
@@ -187,13 +204,41 @@ def one_command_highlights():
         traceback.print_exc()
         return None
 
+def _download_once(url, out):
+    """Download the video a single time for local frame extraction"""
+    cmd = [
+        'yt-dlp',
+        '-f', 'worst[ext=mp4]/worst',
+        '-o', str(out),
+        '--no-playlist',
+        url
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True,
+                            stdin=subprocess.DEVNULL, timeout=1800)
+    return out if result.returncode == 0 and out.exists() else None
+
 def extract_real_screenshots(youtube_url, segments, output_dir):
     """Extract real video screenshots using yt-dlp and ffmpeg"""
     
-    screenshots = []
     output_path = Path(output_dir)
+    if not segments:
+        return []
     
-    for i, segment in enumerate(segments):
+    # Seek straight into the stream when yt-dlp can resolve it, else download once
+    local_video = None
+    video_source = resolve_stream_url(youtube_url, best=False)
+    if not video_source:
+        print("📥 Downloading video for screenshot extraction...")
+        try:
+            local_video = _download_once(youtube_url, output_path / "temp_video.mp4")
+        except Exception as e:
+            print(f"❌ Video download failed: {e}")
+        if local_video is None:
+            print("❌ Could not download video, skipping screenshots")
+            return [None] * len(segments)
+        video_source = str(local_video)
+    
+    def _extract_one(i, segment):
         try:
             # Calculate mid-point of segment
             start_time = segment['start']
@@ -207,86 +252,112 @@ def extract_real_screenshots(youtube_url, segments, output_dir):
             timestamp = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
             
             screenshot_path = output_path / f"screenshot_{i+1:03d}.jpg"
-            temp_video = output_path / f"temp_segment_{i+1}.mp4"
             
             print(f"📸 Extracting screenshot {i+1} at {timestamp}...")
             
-            # Download small video segment
-            download_cmd = [
-                'yt-dlp', 
-                '-f', 'worst[ext=mp4]',
-                '--external-downloader', 'ffmpeg',
-                '--external-downloader-args', f'-ss {max(0, mid_time-2)} -t 4',
-                '-o', str(temp_video),
-                youtube_url
+            # Extract frame from the local file (-ss before -i seeks the input)
+            ffmpeg_cmd = [
+                'ffmpeg',
+                '-ss', str(mid_time),
+                '-i', video_source,
+                '-frames:v', '1',
+                '-vf', "scale='min(640,iw)':-2",  # Cap thumbnail width
+                '-q:v', '5',
+                '-y',
+                str(screenshot_path)
             ]
             
-            result = subprocess.run(download_cmd, capture_output=True, text=True)
+            ffmpeg_result = subprocess.run(ffmpeg_cmd, capture_output=True, text=True,
+                                           stdin=subprocess.DEVNULL, timeout=60)
             
-            if result.returncode == 0 and temp_video.exists():
-                # Extract frame
-                ffmpeg_cmd = [
-                    'ffmpeg',
-                    '-i', str(temp_video),
-                    '-ss', '2',
-                    '-frames:v', '1',
-                    '-q:v', '2',
-                    '-y',
-                    str(screenshot_path)
-                ]
-                
-                ffmpeg_result = subprocess.run(ffmpeg_cmd, capture_output=True, text=True)
-                
-                if ffmpeg_result.returncode == 0 and screenshot_path.exists():
-                    screenshots.append(str(screenshot_path))
-                    print(f"✅ Screenshot {i+1} saved")
-                    temp_video.unlink()  # Clean up
-                else:
-                    screenshots.append(None)
-            else:
-                screenshots.append(None)
+            if ffmpeg_result.returncode == 0 and screenshot_path.exists():
+                print(f"✅ Screenshot {i+1} saved")
+                return i, str(screenshot_path)
+            return i, None
                 
         except Exception as e:
             print(f"❌ Failed to extract screenshot {i+1}: {e}")
-            screenshots.append(None)
+            return i, None
+    
+    # Frames come from one source, so the ffmpeg runs can overlap
+    screenshots = [None] * len(segments)
+    try:
+        with ThreadPoolExecutor(max_workers=min(8, len(segments))) as executor:
+            futures = [executor.submit(_extract_one, i, segment) for i, segment in enumerate(segments)]
+            for future in as_completed(futures):
+                i, path = future.result()
+                screenshots[i] = path
+    finally:
+        if local_video:
+            local_video.unlink(missing_ok=True)  # Clean up
     
     return screenshots
 
+# <img> tags whose alt text carries the card number, plus their src/alt attributes
+_NUMBERED_IMG_RE = re.compile(r'<img[^>]*alt="[^"]*?(\d+)[^"]*"[^>]*>')
+_SRC_ATTR_RE = re.compile(r'src="[^"]*"')
+_ALT_ATTR_RE = re.compile(r'alt="[^"]*"')
+
 def update_html_with_real_screenshots(html_path, screenshots):
     """Update HTML to use real screenshot files"""
     
+    # Card number -> screenshot file name, for screenshots that exist
+    names = {
+        i + 1: Path(screenshot).name
+        for i, screenshot in enumerate(screenshots)
+        if screenshot and Path(screenshot).exists()
+    }
+    
+    def replace_img(match):
+        number = int(match.group(1))
+        if number not in names:
+            return match.group(0)
+        new_img = _SRC_ATTR_RE.sub(f'src="{names[number]}"', match.group(0))
+        return _ALT_ATTR_RE.sub(f'alt="Screenshot {number}"', new_img)
+    
+    if not names:
+        return  # Nothing to swap in, leave the page untouched
+    
     with open(html_path, 'r', encoding='utf-8') as f:
         content = f.read()
     
-    # Replace thumbnail references
-    for i, screenshot in enumerate(screenshots):
-        if screenshot and Path(screenshot).exists():
-            # Look for existing img tags and update them
-            old_patterns = [
-                f'src="thumbnail_{i+1:03d}.png"',
-                f'src="https://img.youtube.com/vi/',
-            ]
-            
-            screenshot_name = Path(screenshot).name
-            new_src = f'src="{screenshot_name}"'
-            
-            # Replace various possible patterns
-            import re
-            pattern = f'<img[^>]*alt="[^"]*{i+1}[^"]*"[^>]*>'
-            matches = re.findall(pattern, content)
-            
-            if matches:
-                old_img = matches[0]
-                new_img = re.sub(r'src="[^"]*"', new_src, old_img)
-                new_img = re.sub(r'alt="[^"]*"', f'alt="Screenshot {i+1}"', new_img)
-                content = content.replace(old_img, new_img)
+    # Replace thumbnail references in a single pass
+    updated = _NUMBERED_IMG_RE.sub(replace_img, content)
+    if updated == content:
+        return
     
     # Save updated HTML
     with open(html_path, 'w', encoding='utf-8') as f:
-        f.write(content)
+        f.write(updated)
 
 def main():
-    one_command_highlights()
+    parser = argparse.ArgumentParser(
+        description="Create a highlight page in one command (interactive unless --url and --transcript-file are given)"
+    )
+    parser.add_argument("--url", help="YouTube video URL")
+    parser.add_argument("--transcript-file", help="Raw transcript text file (any format)")
+    parser.add_argument("--title", help="Page title (default: video title)")
+    parser.add_argument("--keywords", nargs="+", help="Keywords to search for")
+    parser.add_argument("--num-cards", type=int, help="Number of highlight cards (default: 4)")
+    parser.add_argument("--output-dir", help="Output directory (default: highlights_<timestamp>)")
+    args = parser.parse_args()
+    if args.num_cards is not None and args.num_cards < 1:
+        parser.error("--num-cards must be at least 1")
+    
+    raw_transcript = None
+    if args.transcript_file:
+        raw_transcript = Path(args.transcript_file).read_text(encoding='utf-8')
+    
+    result = one_command_highlights(
+        youtube_url=args.url,
+        raw_transcript=raw_transcript,
+        title=args.title,
+        keywords=args.keywords,
+        num_cards=args.num_cards,
+        output_dir=args.output_dir
+    )
+    if result is None and args.url and args.transcript_file:
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -2,10 +2,29 @@
 
 # Manual execution of thumbnail creation
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image, ImageDraw, ImageFont
+import numpy as np
 import io
 from pathlib import Path
 
+def fetch_all(urls, max_workers=4):
+    """Fetch URLs concurrently over one pooled session; returns responses (or None) in order"""
+    with requests.Session() as session:
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=8)
+        session.mount('https://', adapter)
+        
+        def fetch(url):
+            try:
+                return session.get(url, timeout=30)
+            except requests.RequestException as e:
+                print(f"Error downloading {url}: {e}")
+                return None
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(fetch, urls))
+
 def create_thumbnails():
     video_id = "ekgvWeHidJs"
     output_dir = Path("/Volumes/Home/Remote Home/Dev1/genie3_highlights_unique")
@@ -21,15 +40,19 @@ def create_thumbnails():
     thumb_types = ["maxresdefault.jpg", "hqdefault.jpg", "mqdefault.jpg", "sddefault.jpg"]
     colors = [(255, 87, 51), (74, 144, 226), (156, 39, 176), (76, 175, 80)]
     
+    # Download every thumbnail variant up front, reusing the TLS connection
+    urls = [
+        f"https://img.youtube.com/vi/{video_id}/{thumb_types[i % len(thumb_types)]}"
+        for i in range(len(segments))
+    ]
+    print(f"Downloading {len(urls)} thumbnails...")
+    responses = fetch_all(urls)
+    
     for i, segment in enumerate(segments):
         try:
-            thumb_type = thumb_types[i % len(thumb_types)]
-            url = f"https://img.youtube.com/vi/{video_id}/{thumb_type}"
-            
-            print(f"Downloading thumbnail {i+1}...")
-            response = requests.get(url)
+            response = responses[i]
             
-            if response.status_code == 200:
+            if response is not None and response.status_code == 200:
                 img = Image.open(io.BytesIO(response.content))
                 draw = ImageDraw.Draw(img)
                 
@@ -41,21 +64,22 @@ def create_thumbnails():
                 
                 color = colors[i]
                 
-                # Add colored overlay
-                overlay = Image.new('RGBA', img.size, (0, 0, 0, 0))
-                overlay_draw = ImageDraw.Draw(overlay)
+                # Add colored overlay (alpha 100/255) by blending only the band in place
+                arr = np.array(img.convert('RGB'))
                 
                 # Different patterns for each segment
                 if i == 0:  # Top
-                    overlay_draw.rectangle([0, 0, img.width, 80], fill=color + (100,))
+                    region = arr[:81, :]
                 elif i == 1:  # Right
-                    overlay_draw.rectangle([img.width-120, 0, img.width, img.height], fill=color + (100,))
+                    region = arr[:, max(img.width - 120, 0):]
                 elif i == 2:  # Bottom
-                    overlay_draw.rectangle([0, img.height-80, img.width, img.height], fill=color + (100,))
+                    region = arr[max(img.height - 80, 0):, :]
                 else:  # Left
-                    overlay_draw.rectangle([0, 0, 120, img.height], fill=color + (100,))
+                    region = arr[:, :121]
                 
-                img = Image.alpha_composite(img.convert('RGBA'), overlay).convert('RGB')
+                blended = (region.astype(np.uint16) * 155 + np.array(color, np.uint16) * 100 + 127) // 255
+                region[...] = blended.astype(np.uint8)
+                img = Image.fromarray(arr)
                 draw = ImageDraw.Draw(img)
                 
                 # Add text
@@ -74,7 +98,7 @@ def create_thumbnails():
                 
                 # Save
                 screenshot_path = output_dir / f"screenshot_{i+1:03d}.jpg"
-                img.save(screenshot_path, "JPEG", quality=90)
+                img.save(screenshot_path, "JPEG", quality=82, progressive=True, optimize=False, subsampling='4:2:0')
                 print(f"Created: {screenshot_path}")
                 
         except Exception as e:
@@ -6,6 +6,10 @@ Finds the clearest, most interesting frames within video segments
 
 import subprocess
 import os
+import json
+import time
+import hashlib
+import functools
 import sys
 from pathlib import Path
 from typing import Optional, List, Tuple
@@ -14,35 +18,154 @@ import shutil
 from PIL import Image
 import numpy as np
 
+from core.youtube import get_video_id
+
+# OpenCV gives a SIMD Laplacian; fall back to NumPy slicing without it
+try:
+    import cv2
+    HAS_CV2 = True
+except ImportError:
+    HAS_CV2 = False
+
+# PyAV decodes in-process (no ffmpeg fork per strategy) when installed
+try:
+    import av
+    HAS_AV = True
+except ImportError:
+    HAS_AV = False
+
+def _laplacian_variance(gray: np.ndarray) -> float:
+    """Variance of the 4-neighbour Laplacian of a grayscale image (sharpness)"""
+    if HAS_CV2:
+        return float(cv2.Laplacian(gray, cv2.CV_32F).var())
+    g = gray.astype(np.float32)
+    lap = (g[:-2, 1:-1] + g[2:, 1:-1] + g[1:-1, :-2] + g[1:-1, 2:]
+           - 4 * g[1:-1, 1:-1])
+    return float(lap.var()) if lap.size else 0.0
+
+# yt-dlp as a library: resolve stream URLs without re-running the CLI extractor
+try:
+    from yt_dlp import YoutubeDL
+    HAS_YT_DLP_API = True
+except ImportError:
+    HAS_YT_DLP_API = False
+
+# Resolved format lists are reused across runs until YouTube's URL signatures
+# are close to expiring (~6h)
+INFO_CACHE_DIR = Path.home() / ".cache" / "slots"
+INFO_CACHE_MAX_AGE = 5 * 3600
+# Tallest stream worth decoding for thumbnails
+STREAM_MAX_HEIGHT = 720
+
+def _load_formats(video_url: str) -> List[dict]:
+    """mp4 video formats for a URL, from the on-disk cache or a single extract_info call"""
+    key = get_video_id(video_url) or hashlib.sha1(video_url.encode('utf-8')).hexdigest()[:16]
+    cache_file = INFO_CACHE_DIR / f"{key}.json"
+    
+    try:
+        if time.time() - cache_file.stat().st_mtime < INFO_CACHE_MAX_AGE:
+            return json.loads(cache_file.read_text(encoding='utf-8'))['formats']
+    except (OSError, ValueError, KeyError):
+        pass
+    
+    with YoutubeDL({'quiet': True, 'skip_download': True, 'noplaylist': True}) as ydl:
+        info = ydl.extract_info(video_url, download=False)
+    formats = [
+        {'url': f['url'], 'height': f['height'], 'progressive': f.get('acodec') not in (None, 'none'),
+         'h264': (f.get('vcodec') or '').startswith('avc1')}
+        for f in info.get('formats') or []
+        if f.get('ext') == 'mp4' and f.get('vcodec') not in (None, 'none') and f.get('url')
+        and f.get('height')
+    ]
+    
+    try:
+        INFO_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cache_file.write_text(json.dumps({'id': info.get('id'), 'formats': formats}), encoding='utf-8')
+    except OSError:
+        pass
+    return formats
+
+def resolve_stream_url(video_url: str, best: bool = True) -> Optional[str]:
+    """Direct mp4 stream URL ffmpeg/PyAV can read, or None if it can't be resolved"""
+    if not HAS_YT_DLP_API:
+        return None
+    try:
+        formats = _load_formats(video_url)
+    except Exception as e:
+        print(f"⚠️  Could not resolve stream URL: {e}")
+        return None
+    formats = [f for f in formats if f.get('height')]
+    if not formats:
+        return None
+    # Like yt-dlp's best/worst[ext=mp4]: progressive streams first; video-only
+    # DASH streams only without one, and then H.264 rather than VP9/AV1
+    candidates = ([f for f in formats if f.get('progressive')]
+                  or [f for f in formats if f.get('h264')]
+                  or formats)
+    if best:
+        # Thumbnails never need more than STREAM_MAX_HEIGHT; decoding 4K is wasted work
+        capped = [f for f in candidates if f['height'] <= STREAM_MAX_HEIGHT]
+        if capped:
+            return max(capped, key=lambda f: f['height'])['url']
+        return min(candidates, key=lambda f: f['height'])['url']
+    # Smallest stream that is still legible (>=360p)
+    candidates = [f for f in candidates if f['height'] >= 360 or f.get('progressive')] or candidates
+    return min(candidates, key=lambda f: f['height'])['url']
+
+# Thumbnails are shown well under 640px wide: cap width (never upscale) and
+# encode as progressive JPEG at a web quality level
+THUMB_SCALE = "scale='min(640,iw)':-2"
+JPEG_SAVE_OPTIONS = dict(quality=82, progressive=True, optimize=False, subsampling='4:2:0')
+
+@functools.lru_cache(maxsize=1)
+def _ffmpeg_available() -> bool:
+    """Whether an ffmpeg binary is on PATH (looked up once per process)"""
+    return shutil.which('ffmpeg') is not None
+
+@functools.lru_cache(maxsize=1)
+def _yt_dlp_available() -> bool:
+    """Whether a yt-dlp binary is on PATH (looked up once per process)"""
+    return shutil.which('yt-dlp') is not None
+
+# Hardware decoders worth handing H.264 decode to
+_HW_DECODERS = {'videotoolbox', 'cuda', 'vaapi', 'd3d11va'}
+
+@functools.lru_cache(maxsize=1)
+def _hwaccel_args() -> Tuple[str, ...]:
+    """ffmpeg input flags enabling hardware decode, if a known hwaccel is built in"""
+    if not _ffmpeg_available():
+        return ()
+    try:
+        result = subprocess.run(['ffmpeg', '-hide_banner', '-hwaccels'],
+                                capture_output=True, text=True, timeout=10)
+    except (subprocess.SubprocessError, OSError):
+        return ()
+    available = {line.strip() for line in result.stdout.splitlines()[1:]}
+    return ('-hwaccel', 'auto') if available & _HW_DECODERS else ()
+
 class SmartThumbnailExtractor:
     """Extract high-quality, representative thumbnails from video segments"""
     
     def __init__(self):
         self.has_ffmpeg = self._check_ffmpeg()
         self.has_yt_dlp = self._check_yt_dlp()
+        self.hwaccel_args = list(_hwaccel_args()) if self.has_ffmpeg else []
     
     def _check_ffmpeg(self) -> bool:
         """Check if ffmpeg is available"""
-        try:
-            subprocess.run(['ffmpeg', '-version'], capture_output=True, check=True)
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            return False
+        return _ffmpeg_available()
     
     def _check_yt_dlp(self) -> bool:
         """Check if yt-dlp is available"""
-        try:
-            subprocess.run(['yt-dlp', '--version'], capture_output=True, check=True)
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            return False
+        return _yt_dlp_available()
     
     def extract_smart_thumbnail(self, 
                               video_source: str, 
                               segment_start: float,
                               segment_end: float,
                               output_path: Path,
-                              video_url: Optional[str] = None) -> bool:
+                              video_url: Optional[str] = None,
+                              use_pyav: bool = True) -> bool:
         """
         Extract the best thumbnail from a video segment using multiple strategies
         
@@ -52,11 +175,14 @@ class SmartThumbnailExtractor:
             segment_end: End time in seconds  
             output_path: Where to save the thumbnail
             video_url: Optional YouTube URL for fallback download
+            use_pyav: Try in-process PyAV decoding first (skip it when a
+                batch PyAV pass already failed on this source)
             
         Returns:
             True if successful, False otherwise
         """
-        if not self.has_ffmpeg:
+        use_pyav = use_pyav and HAS_AV
+        if not self.has_ffmpeg and not use_pyav:
             print("❌ FFmpeg not found. Install with: brew install ffmpeg")
             return False
         
@@ -64,12 +190,15 @@ class SmartThumbnailExtractor:
         duration = min(segment_end - segment_start, 10)  # Max 10 seconds to analyze
         
         # Try multiple extraction strategies in order of preference
-        strategies = [
-            self._extract_with_thumbnail_filter,
-            self._extract_with_scene_detection,
-            self._extract_middle_frame,
-            self._extract_start_frame
-        ]
+        strategies = []
+        if use_pyav:
+            strategies.append(self._extract_with_pyav)
+        if self.has_ffmpeg:
+            strategies += [
+                self._extract_with_scene_thumbnail,
+                self._extract_middle_frame,
+                self._extract_start_frame
+            ]
         
         for strategy in strategies:
             try:
@@ -86,52 +215,109 @@ class SmartThumbnailExtractor:
         
         return False
     
-    def _extract_with_thumbnail_filter(self, 
-                                      video_source: str,
-                                      start_time: float,
-                                      duration: float,
-                                      output_path: Path) -> bool:
+    def _extract_with_pyav(self,
+                           video_source: str,
+                           start_time: float,
+                           duration: float,
+                           output_path: Path,
+                           max_frames: int = 50) -> bool:
         """
-        Use FFmpeg's thumbnail filter to find the most representative frame
-        This analyzes multiple frames and selects the best one
+        Decode the segment in-process and keep the sharpest frame
         """
-        print(f"  🎯 Using thumbnail filter (analyzing frames)...")
+        print(f"  🎞️  Decoding segment in-process (PyAV)...")
         
-        cmd = [
-            'ffmpeg',
-            '-ss', str(start_time),
-            '-t', str(duration),
-            '-i', video_source,
-            '-vf', 'thumbnail=n=50',  # Analyze 50 frames in the segment
-            '-frames:v', '1',
-            '-q:v', '2',  # High quality
-            '-y',  # Overwrite
-            str(output_path)
-        ]
+        with av.open(video_source) as container:
+            return self._save_sharpest_frame(container, start_time, duration, output_path, max_frames)
+    
+    @staticmethod
+    def _save_sharpest_frame(container,
+                             start_time: float,
+                             duration: float,
+                             output_path: Path,
+                             max_frames: int = 50) -> bool:
+        """
+        Seek an open container to start_time and save the sharpest frame of the window
+        """
+        end_time = start_time + duration
+        stream = container.streams.video[0]
+        container.seek(int(start_time / stream.time_base), stream=stream)
         
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-        return result.returncode == 0 and output_path.exists()
+        best_frame, best_score, seen = None, -1.0, 0
+        for frame in container.decode(stream):
+            # Seeking lands on the keyframe before start_time
+            if frame.time is not None and frame.time < start_time:
+                continue
+            if (frame.time is not None and frame.time > end_time) or seen >= max_frames:
+                break
+            seen += 1
+            
+            small = frame.reformat(width=320, height=180, format='gray')
+            score = _laplacian_variance(small.to_ndarray())
+            if score > best_score:
+                best_frame, best_score = frame, score
+        
+        if best_frame is None:
+            return False
+        best_frame.to_image().save(output_path, 'JPEG', **JPEG_SAVE_OPTIONS)
+        return output_path.exists()
+    
+    def _extract_all_with_pyav(self,
+                               video_source: str,
+                               segments: List[dict],
+                               output_dir: Path) -> List[Optional[Path]]:
+        """
+        Extract every segment's thumbnail from a single open container,
+        visiting segments in time order so seeks only move forward
+        """
+        results: List[Optional[Path]] = [None] * len(segments)
+        order = sorted(range(len(segments)), key=lambda i: segments[i].get('start', 0))
+        
+        try:
+            with av.open(video_source) as container:
+                for i in order:
+                    segment_start = segments[i].get('start', 0)
+                    segment_end = segments[i].get('end', segment_start + 10)
+                    duration = min(segment_end - segment_start, 10)  # Max 10 seconds to analyze
+                    output_path = output_dir / f"thumbnail_{i+1:03d}.jpg"
+                    
+                    try:
+                        if (self._save_sharpest_frame(container, segment_start, duration, output_path)
+                                and self._validate_frame_quality(output_path)):
+                            results[i] = output_path
+                        else:
+                            output_path.unlink(missing_ok=True)
+                    except Exception as e:
+                        print(f"  Segment {i+1} decode failed: {e}")
+        except Exception as e:
+            print(f"⚠️  Could not open video in-process: {e}")
+        
+        return results
     
-    def _extract_with_scene_detection(self,
+    def _extract_with_scene_thumbnail(self,
                                      video_source: str,
                                      start_time: float,
                                      duration: float,
                                      output_path: Path) -> bool:
         """
-        Extract first frame after a scene change (usually clearer)
+        Pick the most representative frame among scene changes in one pass
+        Scene detection and the thumbnail filter share a single decode,
+        and only keyframes are decoded
         """
-        print(f"  🎬 Using scene detection...")
+        print(f"  🎯 Using scene detection + thumbnail filter...")
         
         cmd = [
             'ffmpeg',
+            *self.hwaccel_args,
+            '-skip_frame', 'nokey',  # Decode keyframes only
             '-ss', str(start_time),
             '-t', str(duration),
             '-i', video_source,
-            '-vf', "select='gt(scene,0.3)',showinfo",  # Detect scene changes
+            # Scene-change frames (plus the first one), best of each 25
+            '-vf', f"select='gt(scene,0.3)+eq(n,0)',thumbnail=n=25,{THUMB_SCALE}",
+            '-vsync', '0',
             '-frames:v', '1',
-            '-vsync', 'vfr',
-            '-q:v', '2',
-            '-y',
+            '-q:v', '5',  # Visually lossless at thumbnail size
+            '-y',  # Overwrite
             str(output_path)
         ]
         
@@ -152,10 +338,12 @@ class SmartThumbnailExtractor:
         
         cmd = [
             'ffmpeg',
+            *self.hwaccel_args,
             '-ss', str(middle_time),
             '-i', video_source,
             '-frames:v', '1',
-            '-q:v', '2',
+            '-vf', THUMB_SCALE,
+            '-q:v', '5',
             '-y',
             str(output_path)
         ]
@@ -175,10 +363,12 @@ class SmartThumbnailExtractor:
         
         cmd = [
             'ffmpeg',
+            *self.hwaccel_args,
             '-ss', str(start_time),
             '-i', video_source,
             '-frames:v', '1',
-            '-q:v', '2',
+            '-vf', THUMB_SCALE,
+            '-q:v', '5',
             '-y',
             str(output_path)
         ]
@@ -192,8 +382,13 @@ class SmartThumbnailExtractor:
         Checks for: black frames, excessive blur, low contrast
         """
         try:
+            # Decode straight to a small grayscale frame (JPEG draft mode
+            # lets libjpeg downscale during the IDCT)
             img = Image.open(image_path)
-            img_array = np.array(img.convert('L'))  # Convert to grayscale
+            img.draft('L', (320, 180))
+            img = img.convert('L')
+            img.thumbnail((320, 180), Image.Resampling.BILINEAR)
+            img_array = np.asarray(img, dtype=np.uint8)
             
             # Check for black frame (mean brightness too low)
             mean_brightness = np.mean(img_array)
@@ -208,9 +403,7 @@ class SmartThumbnailExtractor:
             
             # Check for blur using Laplacian variance
             # Higher variance = sharper image
-            laplacian = np.array([[0,1,0],[1,-4,1],[0,1,0]])
-            convolved = np.abs(np.convolve(img_array.flatten(), laplacian.flatten(), mode='same'))
-            blur_measure = np.var(convolved)
+            blur_measure = _laplacian_variance(img_array)
             
             if blur_measure < 100:
                 print(f"    ⚠️  Frame too blurry (sharpness: {blur_measure:.1f})")
@@ -252,7 +445,12 @@ class SmartThumbnailExtractor:
         temp_video = None
         
         if video_url.startswith('http'):
-            if self.has_yt_dlp:
+            # Prefer reading the stream directly (no download) when it resolves
+            stream_url = resolve_stream_url(video_url)
+            if stream_url:
+                video_source = stream_url
+                print("✅ Reading video stream directly")
+            elif self.has_yt_dlp:
                 print("📥 Downloading video for thumbnail extraction...")
                 temp_video = output_dir / "temp_video.mp4"
                 
@@ -271,8 +469,21 @@ class SmartThumbnailExtractor:
                 else:
                     print("❌ Video download failed, will try direct extraction")
         
+        # Decode all segments from one open container first (PyAV), then fall
+        # back to per-segment strategies for whatever it couldn't produce
+        if HAS_AV:
+            print("🎞️  Extracting all thumbnails from a single decode session...")
+            done = self._extract_all_with_pyav(video_source, segments, output_dir)
+        else:
+            done = [None] * len(segments)
+        
         # Extract thumbnail for each segment
         for i, segment in enumerate(segments):
+            if done[i] is not None:
+                thumbnails.append(done[i])
+                print(f"  ✅ Thumbnail {i+1} saved: {done[i].name}")
+                continue
+            
             print(f"\n📸 Extracting thumbnail {i+1}/{len(segments)}...")
             
             segment_start = segment.get('start', 0)
@@ -284,7 +495,8 @@ class SmartThumbnailExtractor:
                 segment_start,
                 segment_end,
                 output_path,
-                video_url
+                video_url,
+                use_pyav=False  # The batch pass above already tried PyAV
             )
             
             if success and output_path.exists():
@@ -0,0 +1,76 @@
+let player;
+let playerReady = false;
+
+// Load YouTube IFrame API
+const tag = document.createElement('script');
+tag.src = "https://www.youtube.com/iframe_api";
+const firstScriptTag = document.getElementsByTagName('script')[0];
+firstScriptTag.parentNode.insertBefore(tag, firstScriptTag);
+
+// YouTube API callback
+function onYouTubeIframeAPIReady() {
+    player = new YT.Player('youtube-player', {
+        events: {
+            'onReady': onPlayerReady,
+            'onError': onPlayerError
+        }
+    });
+}
+
+function onPlayerReady(event) {
+    playerReady = true;
+    console.log('YouTube player ready');
+    setupCardClickHandlers();
+}
+
+function onPlayerError(event) {
+    console.error('YouTube player error:', event.data);
+    // Fall back to basic method
+    playerReady = false;
+}
+
+function seekToTime(seconds) {
+    console.log('Seeking to:', seconds, 'seconds');
+
+    if (playerReady && player && player.seekTo) {
+        // Use YouTube API
+        player.seekTo(seconds, true);
+        player.playVideo();
+    } else {
+        // Fallback: reload iframe with timestamp
+        const iframe = document.getElementById('youtube-player');
+        const src = iframe.src;
+        const baseUrl = src.split('?')[0];
+        iframe.src = baseUrl + '?enablejsapi=1&start=' + seconds + '&autoplay=1';
+    }
+
+    // Smooth scroll to video
+    document.querySelector('.video-container').scrollIntoView({
+        behavior: 'smooth',
+        block: 'center'
+    });
+}
+
+function setupCardClickHandlers() {
+    // Make entire cards clickable
+    document.querySelectorAll('.highlight-card').forEach(card => {
+        card.addEventListener('click', function(e) {
+            // Don't trigger if clicking a link inside the card
+            if (e.target.tagName === 'A') return;
+
+            const timestamp = parseInt(this.getAttribute('data-timestamp'));
+            if (!isNaN(timestamp)) {
+                seekToTime(timestamp);
+            }
+        });
+    });
+}
+
+// Set up handlers when DOM is ready
+document.addEventListener('DOMContentLoaded', function() {
+    // Try to set up handlers immediately
+    setupCardClickHandlers();
+
+    // Also try again after a delay in case player loads slowly
+    setTimeout(setupCardClickHandlers, 2000);
+});
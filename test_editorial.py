@@ -5,7 +5,25 @@ Verifies all components are properly installed and configured
 """
 
 import sys
+import shutil
 import importlib
+import importlib.util
+import subprocess
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def _probe_spec(name):
+    """Return whether a module is installed, without executing it"""
+    return importlib.util.find_spec(name) is not None
+
+
+@lru_cache(maxsize=1)
+def _git_version():
+    """Run git --version once (None when git is not on PATH)"""
+    if shutil.which('git') is None:
+        return None
+    return subprocess.run(['git', '--version'], capture_output=True, text=True)
 
 
 def test_imports():
@@ -23,6 +41,11 @@ def test_imports():
     
     for module_name, class_name in modules_to_test:
         try:
+            # Cheap filesystem check first; only import what's there to hasattr it
+            if not _probe_spec(module_name):
+                print(f"  ✗ {module_name}: not found")
+                all_good = False
+                continue
             module = importlib.import_module(module_name)
             if hasattr(module, class_name):
                 print(f"  ✓ {module_name}.{class_name}")
@@ -58,20 +81,18 @@ def test_dependencies():
     
     # Test required dependencies
     for dep in dependencies:
-        try:
-            __import__(dep)
+        if _probe_spec(dep):
             print(f"  ✓ {dep}")
-        except ImportError:
+        else:
             print(f"  ✗ {dep} - REQUIRED")
             all_good = False
     
     # Test optional dependencies
     print("\nOptional dependencies:")
     for dep, purpose in optional_deps:
-        try:
-            __import__(dep)
+        if _probe_spec(dep):
             print(f"  ✓ {dep} ({purpose})")
-        except ImportError:
+        else:
             print(f"  ⚠ {dep} ({purpose}) - Optional but recommended")
     
     return all_good
@@ -81,18 +102,16 @@ def test_git():
     """Test that git is available"""
     print("\nTesting Git...")
     
-    import subprocess
-    try:
-        result = subprocess.run(['git', '--version'], capture_output=True, text=True)
-        if result.returncode == 0:
-            print(f"  ✓ Git installed: {result.stdout.strip()}")
-            return True
-        else:
-            print("  ✗ Git not working properly")
-            return False
-    except FileNotFoundError:
+    result = _git_version()
+    if result is None:
         print("  ✗ Git not found - REQUIRED for deployment")
         return False
+    if result.returncode == 0:
+        print(f"  ✓ Git installed: {result.stdout.strip()}")
+        return True
+    else:
+        print("  ✗ Git not working properly")
+        return False
 
 
 def test_config():
@@ -3,13 +3,25 @@
 Test script for smart thumbnail extraction
 """
 
+import os
 import sys
+import shutil
+import functools
 from pathlib import Path
 from generate_video_cards import VideoProcessor, SegmentFinder, TranscriptParser
 
+@functools.lru_cache(maxsize=1)
+def _tools_available():
+    """Check once for ffmpeg and yt-dlp on PATH (no subprocess)"""
+    return bool(shutil.which('ffmpeg') and shutil.which('yt-dlp'))
+
 def test_smart_extraction(video_url=None):
     """Test the smart thumbnail extraction"""
     
+    if not _tools_available():
+        print("⏭️  Skipping smart extraction test: ffmpeg and yt-dlp are required")
+        return True
+    
     # Test video URL (you can change this to any YouTube video)
     if not video_url:
         video_url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
@@ -45,12 +57,14 @@ def test_smart_extraction(video_url=None):
     
     success_count = 0
     for i, thumb in enumerate(thumbnails):
-        if thumb and Path(thumb).exists():
-            file_size = Path(thumb).stat().st_size / 1024  # KB
-            print(f"✅ Segment {i+1}: {Path(thumb).name} ({file_size:.1f} KB)")
-            success_count += 1
-        else:
+        try:
+            # One stat answers both "exists?" and "how big?"
+            file_size = os.stat(thumb).st_size / 1024  # KB
+        except (TypeError, OSError):
             print(f"❌ Segment {i+1}: Failed to extract")
+            continue
+        print(f"✅ Segment {i+1}: {Path(thumb).name} ({file_size:.1f} KB)")
+        success_count += 1
     
     print("-" * 40)
     print(f"Success rate: {success_count}/{len(test_segments)} thumbnails")
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test that resumed VTT conversion of a growing transcript matches a fresh one
+"""
+
+import io
+import tempfile
+import contextlib
+from pathlib import Path
+import transcript_converter
+
+# Timestamped transcript; cuts land mid-line and mid-timestamp ("1:02:" -> "1:02:03")
+SAMPLE_TRANSCRIPT = """0:01 Welcome to this introduction video
+0:05
+Today we'll cover the main topics
+and a few side notes
+
+0:12 First, let's discuss the methodology
+1:02:03 The results show significant improvement 4:05 again
+1:02:30
+1:03:00 In conclusion, this approach works well
+"""
+
+UNTIMED_TRANSCRIPT = "Welcome to the demo. Today we look at results!\nIn conclusion it works. Thanks for watching"
+
+def _convert(raw_text, output_file, use_cache):
+    """Convert quietly and return the VTT bytes"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        transcript_converter.convert_raw_transcript_to_vtt(raw_text, output_file, use_cache=use_cache)
+    return Path(output_file).read_bytes()
+
+def test_incremental_conversion():
+    """Convert ever longer prefixes into one file and compare with fresh conversions"""
+    all_passed = True
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        # Keep the cache and resume state out of the real ~/.cache
+        transcript_converter.VTT_CACHE_DIR = tmp / "cache"
+        transcript_converter.VTT_STATE_DIR = tmp / "cache" / "state"
+        transcript_converter.VTT_EVICT_INTERVAL = 0  # Evict on every store
+
+        print("🧪 Testing incremental VTT conversion:")
+        print("=" * 40)
+
+        for name, text in (("timestamped", SAMPLE_TRANSCRIPT), ("untimed", UNTIMED_TRANSCRIPT)):
+            grown = tmp / f"{name}.vtt"
+            mismatches = [
+                cut for cut in range(1, len(text) + 1)
+                if _convert(text[:cut], grown, True) != _convert(text[:cut], tmp / "fresh.vtt", False)
+            ]
+            if mismatches:
+                print(f"❌ Failed: {name} transcript differs after growing to {mismatches[:5]} chars")
+                all_passed = False
+            else:
+                print(f"✅ {name.capitalize()} transcript matches a fresh conversion at every length")
+
+        # Resume state for deleted outputs is cleaned up on the next cached conversion
+        (tmp / "timestamped.vtt").unlink()
+        _convert("0:01 something new\n0:05 and more\n", tmp / "other.vtt", True)
+        # (untimed text never gets resume state, so only other.vtt's should remain)
+        left = {path.name for path in transcript_converter.VTT_STATE_DIR.glob("*.json")}
+        if left == {transcript_converter._state_file(tmp / "other.vtt").name}:
+            print("✅ Resume state for deleted outputs is removed")
+        else:
+            print(f"❌ Failed: {len(left)} resume state files left behind")
+            all_passed = False
+
+        # Appending must not leave a full cached copy per update behind
+        for path in transcript_converter.VTT_CACHE_DIR.glob("*.*"):
+            path.unlink()
+        lines = SAMPLE_TRANSCRIPT.splitlines(keepends=True)
+        for end in range(1, len(lines) + 1):
+            _convert(''.join(lines[:end]), tmp / "appended.vtt", True)
+        entries = len(list(transcript_converter.VTT_CACHE_DIR.glob("*.vtt")))
+        if entries <= 1:
+            print(f"✅ Appending keeps at most one cache entry ({entries} after {len(lines)} updates)")
+        else:
+            print(f"❌ Failed: {len(lines)} appends left {entries} cache entries")
+            all_passed = False
+
+    print("=" * 40)
+    if all_passed:
+        print("✨ All tests passed!")
+    else:
+        print("⚠️ Some tests failed. Check the implementation.")
+
+    return all_passed
+
+if __name__ == "__main__":
+    test_incremental_conversion()
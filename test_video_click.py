@@ -4,9 +4,16 @@ Test script to verify that video card clicks work properly
 """
 
 import os
+import re
+import mmap
 from pathlib import Path
 from generate_video_cards import HTMLGenerator
 
+def _scan(path, needles):
+    """Return the indices of the bytes needle regexes found in a file, searched via mmap"""
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return {i for i, needle in enumerate(needles) if re.search(needle, mm)}
+
 def test_html_generation():
     """Test that HTML is generated with proper click handlers"""
     
@@ -43,21 +50,27 @@ def test_html_generation():
         thumbnails=[]
     )
     
-    # Read generated HTML
-    with open(html_path, 'r') as f:
-        html_content = f.read()
-    
-    # Check for key improvements
-    checks = [
-        ('data-timestamp=' in html_content, "✅ Cards have data-timestamp attributes"),
-        ('cursor: pointer' in html_content, "✅ Cards have pointer cursor"),
-        ('onYouTubeIframeAPIReady' in html_content, "✅ YouTube IFrame API is integrated"),
-        ('playerReady' in html_content, "✅ Player ready state tracking"),
-        ('setupCardClickHandlers' in html_content, "✅ Card click handlers setup"),
-        ('highlight-card:active' in html_content, "✅ Active state styling added"),
-        ('fallback' in html_content.lower(), "✅ Fallback mechanism included")
+    # Check for key improvements: (file, needle regex, message). Static
+    # CSS/JS are emitted next to index.html
+    expectations = [
+        ('index.html', re.escape(b'data-timestamp='), "✅ Cards have data-timestamp attributes"),
+        ('index.html', re.escape(b'href="styles.css"'), "✅ Stylesheet is linked"),
+        ('index.html', re.escape(b'src="player.js"'), "✅ Player script is linked"),
+        ('styles.css', re.escape(b'cursor: pointer'), "✅ Cards have pointer cursor"),
+        ('player.js', b'onYouTubeIframeAPIReady', "✅ YouTube IFrame API is integrated"),
+        ('player.js', b'playerReady', "✅ Player ready state tracking"),
+        ('player.js', b'setupCardClickHandlers', "✅ Card click handlers setup"),
+        ('styles.css', re.escape(b'highlight-card:active'), "✅ Active state styling added"),
+        ('player.js', b'(?i:fallback)', "✅ Fallback mechanism included")
     ]
     
+    # Search each file for its needles in place, without decoding it
+    found = set()
+    for name in ('index.html', 'styles.css', 'player.js'):
+        wanted = [needle for doc, needle, _ in expectations if doc == name]
+        found.update((name, wanted[i]) for i in _scan(output_dir / name, wanted))
+    checks = [((doc, needle) in found, message) for doc, needle, message in expectations]
+    
     print("🧪 Testing HTML Generation:")
     print("=" * 40)
     
@@ -3,24 +3,66 @@
 Convert raw YouTube transcript text to VTT format
 """
 
+import os
 import re
+import sys
+import json
+import time
+import hashlib
+import shutil
 from pathlib import Path
 
-def convert_raw_transcript_to_vtt(raw_text, output_file):
+# Converted VTT files, keyed by the SHA-1 of the raw transcript, and
+# per-output resume state for transcripts that keep growing
+VTT_CACHE_DIR = Path.home() / ".cache" / "slots" / "vtt"
+VTT_STATE_DIR = VTT_CACHE_DIR / "state"
+VTT_CACHE_MAX_AGE = 30 * 24 * 3600  # Entries unused for 30 days are evicted
+VTT_EVICT_INTERVAL = 3600  # Scan for stale entries at most once an hour
+VTT_HEADER = b"WEBVTT\n\n"
+
+# Timestamps like 2:30 or 1:02:30, anywhere in a line
+_TS_SEARCH = re.compile(r'(\d+):(\d+)(?::(\d+))?')
+_TS_STRIP = re.compile(r'\d+:\d+(?::\d+)?\s*')
+_SENT_SPLIT = re.compile(r'[.!?]+')
+# Start of every line that carries a timestamp
+_TS_LINE = re.compile(r'^[^\n]*?\d+:\d+', re.MULTILINE)
+
+def _has_timestamps(lines):
+    """Whether any of the first five lines carries a timestamp"""
+    return any(_TS_SEARCH.search(line) for line in lines[:5])
+
+def _iter_sentences(lines):
+    """Yield the stripped sentences of lines as if they were joined with spaces"""
+    # Terminator runs never span lines, so each line splits on its own; the
+    # first piece of a line continues the sentence carried from the last one
+    parts = []
+    for line in lines:
+        pieces = _SENT_SPLIT.split(line)
+        parts.append(pieces[0])
+        for piece in pieces[1:]:
+            sentence = ' '.join(parts).strip()
+            if sentence:
+                yield sentence
+            parts = [piece]
+    
+    sentence = ' '.join(parts).strip()
+    if sentence:
+        yield sentence
+
+def iter_segments(raw_text):
     """
-    Convert raw YouTube transcript text to VTT format
+    Lazily yield (time, text) segments from raw YouTube transcript text
     Handles various formats of raw transcript text
     """
     
     # Clean up the text
     lines = raw_text.strip().split('\n')
-    segments = []
     
     # Try to detect if text has timestamps already
-    has_timestamps = any(re.search(r'\d+:\d+', line) for line in lines[:5])
-    
-    if has_timestamps:
+    if _has_timestamps(lines):
         # Parse text that already has timestamps
+        search = _TS_SEARCH.search
+        strip_timestamps = _TS_STRIP.sub
         current_text = []
         current_time = None
         
@@ -30,133 +72,324 @@ def convert_raw_transcript_to_vtt(raw_text, output_file):
                 continue
                 
             # Look for timestamp patterns
-            time_match = re.search(r'(\d+):(\d+)(?::(\d+))?', line)
+            time_match = search(line)
             
             if time_match:
-                # Save previous segment if we have one
-                if current_time is not None and current_text:
-                    segments.append({
-                        'time': current_time,
-                        'text': ' '.join(current_text).strip()
-                    })
+                # Emit previous segment if we have one (parts are stripped and non-empty)
+                if current_text:
+                    yield current_time, ' '.join(current_text)
                 
                 # Start new segment
-                minutes = int(time_match.group(1))
-                seconds = int(time_match.group(2))
-                subseconds = int(time_match.group(3)) if time_match.group(3) else 0
-                current_time = minutes * 60 + seconds + (subseconds / 60.0)
+                minutes, seconds, subseconds = time_match.groups()
+                current_time = int(minutes) * 60 + int(seconds) + (int(subseconds) / 60.0 if subseconds else 0.0)
                 
                 # Get text after timestamp
-                text_after_time = re.sub(r'\d+:\d+(?::\d+)?\s*', '', line).strip()
+                text_after_time = strip_timestamps('', line).strip()
                 current_text = [text_after_time] if text_after_time else []
-            else:
+            elif current_time is not None:
                 # Add to current segment text
-                if line and current_time is not None:
-                    current_text.append(line)
+                current_text.append(line)
         
-        # Add final segment
-        if current_time is not None and current_text:
-            segments.append({
-                'time': current_time,
-                'text': ' '.join(current_text).strip()
-            })
+        # Emit final segment
+        if current_text:
+            yield current_time, ' '.join(current_text)
     
     else:
         # No timestamps - split into chunks and estimate timing
         # Assume average reading speed of 150 words per minute
         words_per_second = 2.5
         
-        # Join all text and split into sentences
-        full_text = ' '.join(lines)
-        sentences = re.split(r'[.!?]+', full_text)
-        sentences = [s.strip() for s in sentences if s.strip()]
-        
         current_time = 0
-        for sentence in sentences:
-            if not sentence:
-                continue
-                
+        for sentence in _iter_sentences(lines):
             word_count = len(sentence.split())
             duration = max(2.0, word_count / words_per_second)  # Minimum 2 seconds
             
-            segments.append({
-                'time': current_time,
-                'text': sentence.strip()
-            })
+            yield current_time, sentence
             
             current_time += duration
+
+def iter_cues(raw_text):
+    """Yield (start, end, text) cues, ending each at the next segment's start"""
+    return _with_end_times(iter_segments(raw_text))
+
+def _with_end_times(segments):
+    """Turn (time, text) segments into (start, end, text) cues with one lookahead"""
+    prev_time = prev_text = None
+    for time, text in segments:
+        if prev_text:
+            yield prev_time, time, prev_text
+        prev_time, prev_text = time, text
     
-    # Generate VTT content
-    vtt_content = "WEBVTT\n\n"
+    # Last segment runs for 5 seconds
+    if prev_text:
+        yield prev_time, prev_time + 5.0, prev_text
+
+def _write_cues(f, cues, offset):
+    """Write cues at byte offset; return (start offset of each cue, end offset)"""
+    offsets = []
     
-    for i, segment in enumerate(segments):
-        if not segment['text']:
-            continue
-            
-        start_time = segment['time']
-        
-        # Calculate end time (start of next segment or +5 seconds)
-        if i + 1 < len(segments):
-            end_time = segments[i + 1]['time']
+    prev_end = prev_end_formatted = None
+    for start_time, end_time, text in cues:
+        # Format times as MM:SS.mmm; a cue starts where the previous one
+        # ended, so that timestamp is formatted only once
+        if start_time == prev_end:
+            start_formatted = prev_end_formatted
         else:
-            end_time = start_time + 5.0
-        
-        # Format times as MM:SS.mmm
-        start_formatted = format_vtt_time(start_time)
-        end_formatted = format_vtt_time(end_time)
+            start_formatted = format_vtt_time(start_time)
+        prev_end, prev_end_formatted = end_time, format_vtt_time(end_time)
+        chunk = f"{start_formatted} --> {prev_end_formatted}\n{text}\n\n".encode('utf-8')
+        f.write(chunk)
+        offsets.append(offset)
+        offset += len(chunk)
+    
+    return offsets, offset
+
+def _span_has_text(span):
+    """Whether a timestamp line and its continuation lines make a non-empty cue"""
+    first, _, rest = span.partition('\n')
+    return bool(_TS_STRIP.sub('', first).strip() or rest.strip())
+
+def _resume_offset(raw_text, start=0):
+    """
+    Offset in raw_text (from start) of the last timestamp line whose cue is
+    settled by complete lines alone
+    
+    Appending text can only change the unfinished last line, which may still
+    grow into a timestamp; so cues before this line are final, with final end
+    times, however the transcript grows. None for untimed text, whose
+    estimated times depend on every earlier sentence.
+    """
+    complete = raw_text[start:raw_text.rfind('\n') + 1]
+    text = complete.strip()
+    if not _has_timestamps(text.split('\n', 5)):
+        return None
+    starts = [match.start() for match in _TS_LINE.finditer(text)]
+    end = len(text)
+    for line_start in reversed(starts):
+        if _span_has_text(text[line_start:end]):
+            return start + len(complete) - len(complete.lstrip()) + line_start
+        end = line_start
+    return None
+
+def _state_file(output_file):
+    """Resume state location for an output file (kept out of the output folder)"""
+    key = hashlib.sha1(str(Path(output_file).resolve()).encode('utf-8')).hexdigest()
+    return VTT_STATE_DIR / f"{key}.json"
+
+def _save_state(output_file, state):
+    """Record how output_file was built (None forgets it)"""
+    state_file = _state_file(output_file)
+    try:
+        if state is None:
+            state_file.unlink(missing_ok=True)
+        else:
+            VTT_STATE_DIR.mkdir(parents=True, exist_ok=True)
+            state_file.write_text(json.dumps(state), encoding='utf-8')
+    except OSError:
+        pass
+
+def _load_state(output_file, raw_text, src_sha1):
+    """Resume state for output_file if raw_text (digest src_sha1) extends what it was built from"""
+    try:
+        state = json.loads(_state_file(output_file).read_text(encoding='utf-8'))
+        size = state['src_size']
+        if len(raw_text) < size or Path(output_file).stat().st_size != state['vtt_size']:
+            return None
+        # The whole text's digest is at hand; only a grown text needs its prefix hashed
+        prefix_sha1 = src_sha1 if len(raw_text) == size else hashlib.sha1(raw_text[:size].encode('utf-8')).hexdigest()
+        if prefix_sha1 == state['src_sha1']:
+            return state
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return None
+
+def _build_state(output_file, raw_text, src_sha1, count, base, offsets, vtt_size, start=0):
+    """State for a VTT whose cues from index base start at offsets"""
+    resume_offset = _resume_offset(raw_text, start)
+    if resume_offset is None:
+        return None
+    # Cues from the resume line onward get rewritten on the next append
+    keep = count - sum(1 for _ in iter_segments(raw_text[resume_offset:]))
+    if not base <= keep < base + len(offsets):
+        return None
+    return {
+        'output': str(Path(output_file).resolve()),
+        'src_size': len(raw_text),
+        'src_sha1': src_sha1,
+        'resume_offset': resume_offset,
+        'keep': keep,
+        'vtt_offset': offsets[keep - base],
+        'vtt_size': vtt_size,
+        'count': count
+    }
+
+def _evict_stale_cache():
+    """
+    Remove cached VTT files (and their cue counts) not used for
+    VTT_CACHE_MAX_AGE, and resume state whose output file is gone or stale
+    """
+    # A marker file's mtime records the last scan
+    marker = VTT_CACHE_DIR / ".last_eviction"
+    now = time.time()
+    try:
+        if now - marker.stat().st_mtime < VTT_EVICT_INTERVAL:
+            return
+    except OSError:
+        pass
+    try:
+        marker.touch()
+    except OSError:
+        pass
+    
+    cutoff = now - VTT_CACHE_MAX_AGE
+    for path in VTT_CACHE_DIR.glob("*.vtt"):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                path.with_suffix(".json").unlink(missing_ok=True)
+        except OSError:
+            pass
+    for path in VTT_STATE_DIR.glob("*.json"):
+        try:
+            try:
+                output = Path(json.loads(path.read_text(encoding='utf-8'))['output'])
+            except (ValueError, KeyError, TypeError):
+                output = None  # Unreadable state can't be resumed from anyway
+            if output is None or not output.exists() or path.stat().st_mtime < cutoff:
+                path.unlink()
+        except OSError:
+            pass
+
+def _store_in_cache(output_file, cache_file, count):
+    """Copy a converted VTT into the cache, with its cue count alongside"""
+    try:
+        VTT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        _evict_stale_cache()
+        shutil.copyfile(output_file, cache_file)
+        cache_file.with_suffix(".json").write_text(json.dumps({'count': count}), encoding='utf-8')
+    except OSError:
+        pass
+
+def _drop_from_cache(cache_file):
+    """Remove a cache entry and its cue count"""
+    try:
+        cache_file.unlink(missing_ok=True)
+        cache_file.with_suffix(".json").unlink(missing_ok=True)
+    except OSError:
+        pass
+
+def _load_from_cache(cache_file):
+    """(VTT bytes, cue count) for a cache entry, or None on a miss"""
+    try:
+        count = json.loads(cache_file.with_suffix(".json").read_text(encoding='utf-8'))['count']
+        data = cache_file.read_bytes()
+        os.utime(cache_file)  # Mark as recently used, for eviction
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    return data, count
+
+def convert_raw_transcript_to_vtt(raw_text, output_file, use_cache=False):
+    """
+    Convert raw YouTube transcript text to VTT format
+    Handles various formats of raw transcript text
+    
+    With use_cache, converted files are kept in VTT_CACHE_DIR and reused for
+    the same (or a grown) transcript; the command line turns this on.
+    """
+    if use_cache:
+        # One digest of the text keys the cache and goes into the resume state
+        src_sha1 = hashlib.sha1(raw_text.encode('utf-8')).hexdigest()
+        cache_file = VTT_CACHE_DIR / f"{src_sha1}.vtt"
+        state = _load_state(output_file, raw_text, src_sha1)
+    else:
+        state = None
+    
+    if state is not None and len(raw_text) == state['src_size']:
+        # Same transcript this file was built from: nothing to do
+        count = state['count']
+        print(f"✅ Converted transcript to VTT format: {output_file} (up to date)")
+        print(f"📊 Created {count} segments")
+        return str(output_file)
+    
+    resumed = state is not None
+    if resumed:
+        # The transcript grew: rewrite from the first unsettled cue, keep the rest
+        with open(output_file, 'r+b', buffering=1 << 20) as f:
+            f.seek(state['vtt_offset'])
+            f.truncate()
+            offsets, vtt_size = _write_cues(
+                f, iter_cues(raw_text[state['resume_offset']:]), state['vtt_offset']
+            )
+        count = state['keep'] + len(offsets)
+        # A growing transcript would leave a full copy in the cache per update,
+        # so resumed files aren't cached, and the prefix's entry is superseded
+        _drop_from_cache(VTT_CACHE_DIR / f"{state['src_sha1']}.vtt")
+        state = _build_state(output_file, raw_text, src_sha1, count, state['keep'], offsets, vtt_size, state['resume_offset'])
+        label = " (appended)"
+    else:
+        cached = _load_from_cache(cache_file) if use_cache else None
+        if cached is not None:
+            data, count = cached
+            Path(output_file).write_bytes(data)
+            _save_state(output_file, None)
+            print(f"✅ Converted transcript to VTT format: {output_file} (cached)")
+            print(f"📊 Created {count} segments")
+            return str(output_file)
         
-        vtt_content += f"{start_formatted} --> {end_formatted}\n"
-        vtt_content += f"{segment['text']}\n\n"
+        # Stream VTT cues straight to the file
+        # (binary, so cues are encoded once each and newlines stay LF everywhere)
+        with open(output_file, 'wb', buffering=1 << 20) as f:
+            f.write(VTT_HEADER)
+            offsets, vtt_size = _write_cues(f, iter_cues(raw_text), len(VTT_HEADER))
+        count = len(offsets)
+        state = _build_state(output_file, raw_text, src_sha1, count, 0, offsets, vtt_size) if use_cache else None
+        label = ""
     
-    # Save VTT file
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(vtt_content)
+    # Without the cache, state is dropped so it can't go stale
+    _save_state(output_file, state)
+    if use_cache and not resumed:
+        _store_in_cache(output_file, cache_file, count)
     
-    print(f"✅ Converted transcript to VTT format: {output_file}")
-    print(f"📊 Created {len(segments)} segments")
+    print(f"✅ Converted transcript to VTT format: {output_file}{label}")
+    print(f"📊 Created {count} segments")
     
     return str(output_file)
 
 def format_vtt_time(seconds):
     """Format seconds as MM:SS.mmm for VTT"""
-    minutes = int(seconds // 60)
-    secs = seconds % 60
-    return f"{minutes:02d}:{secs:06.3f}"
+    # Whole milliseconds first, then integer fields only
+    ms = round(seconds * 1000)
+    return "%02d:%02d.%03d" % (ms // 60000, ms // 1000 % 60, ms % 1000)
 
-def interactive_converter():
+def interactive_converter(use_cache=True):
     """Interactive transcript converter"""
     print("🎬 YouTube Transcript to VTT Converter")
     print("=" * 40)
     
-    print("\nPaste your YouTube transcript below.")
-    print("You can include timestamps (like '2:30 some text') or just raw text.")
-    print("Press Enter twice when done:\n")
+    interactive = sys.stdin.isatty()
+    if interactive:
+        print("\nPaste your YouTube transcript below.")
+        print("You can include timestamps (like '2:30 some text') or just raw text.")
+        print("Press Ctrl-D (Ctrl-Z then Enter on Windows) when done:\n")
     
-    lines = []
-    empty_count = 0
+    # One bulk read, whether piped or pasted
+    try:
+        raw_text = sys.stdin.read()
+    except KeyboardInterrupt:
+        raw_text = ""
     
-    while True:
-        try:
-            line = input()
-            if line.strip() == "":
-                empty_count += 1
-                if empty_count >= 2:  # Two empty lines = done
-                    break
-            else:
-                empty_count = 0
-                lines.append(line)
-        except (EOFError, KeyboardInterrupt):
-            break
-    
-    if not lines:
+    if not raw_text.strip():
         print("❌ No transcript text provided")
         return
     
-    raw_text = '\n'.join(lines)
-    
-    # Ask for output filename
+    # Ask for output filename (piped input has used up stdin, so take the default)
     default_name = "transcript.vtt"
-    output_name = input(f"\nOutput filename (default: {default_name}): ").strip()
+    output_name = ""
+    if interactive:
+        try:
+            output_name = input(f"\nOutput filename (default: {default_name}): ").strip()
+        except EOFError:
+            pass
     if not output_name:
         output_name = default_name
     
@@ -164,7 +397,7 @@ def interactive_converter():
         output_name += '.vtt'
     
     # Convert
-    output_path = convert_raw_transcript_to_vtt(raw_text, output_name)
+    output_path = convert_raw_transcript_to_vtt(raw_text, output_name, use_cache=use_cache)
     
     print(f"\n🎉 Success!")
     print(f"📁 VTT file created: {output_path}")
@@ -172,20 +405,22 @@ def interactive_converter():
     print(f"python3 easy_highlights.py")
 
 def main():
-    import sys
+    # --no-cache always reconverts instead of reusing a cached VTT
+    args = [arg for arg in sys.argv[1:] if arg != '--no-cache']
+    use_cache = len(args) == len(sys.argv) - 1
     
-    if len(sys.argv) > 1:
+    if args:
         # File mode
-        input_file = sys.argv[1]
-        output_file = sys.argv[2] if len(sys.argv) > 2 else "transcript.vtt"
+        input_file = args[0]
+        output_file = args[1] if len(args) > 1 else "transcript.vtt"
         
         with open(input_file, 'r', encoding='utf-8') as f:
             raw_text = f.read()
         
-        convert_raw_transcript_to_vtt(raw_text, output_file)
+        convert_raw_transcript_to_vtt(raw_text, output_file, use_cache=use_cache)
     else:
         # Interactive mode
-        interactive_converter()
+        interactive_converter(use_cache=use_cache)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file